@@ -0,0 +1,165 @@
+"""Persistent cache of LLM analyses keyed on normalized CV and job description content."""
+from database.db import db
+from app.models.analysis_cache import AnalysisCacheEntry
+from config import (
+    OLLAMA_MODEL, CV_ANALYSIS_TEMPLATE_VERSION,
+    ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_WRITE_BATCH, ANALYSIS_CACHE_EVICT_EVERY
+)
+from datetime import datetime, timezone
+from sqlalchemy import bindparam, func, select
+from typing import Dict, Optional
+import hashlib
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+_stats_lock = threading.Lock()
+
+# Cache writes are buffered and flushed together, off the caller's session
+_pending_hits: Dict[str, int] = {}
+_pending_stores: Dict[str, Dict] = {}
+_stores_since_eviction = 0
+_buffer_lock = threading.Lock()
+
+
+def _count(stat: str, amount: int = 1):
+    with _stats_lock:
+        _stats[stat] += amount
+
+
+def content_hash(text: str) -> str:
+    """Hash text after collapsing whitespace, so formatting-only changes hit the same entry."""
+    normalized = ' '.join((text or '').split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def cache_key(cv_text: str, job_description: str, model: str = OLLAMA_MODEL,
+              template_version: int = CV_ANALYSIS_TEMPLATE_VERSION) -> str:
+    """Build the cache key for a (CV, job description, model, prompt template) combination."""
+    return hashed_cache_key(content_hash(cv_text), content_hash(job_description), model, template_version)
+
+
+def hashed_cache_key(cv_hash: str, job_hash: str, model: str = OLLAMA_MODEL,
+                     template_version: int = CV_ANALYSIS_TEMPLATE_VERSION) -> str:
+    """Build the cache key from the content hashes of the CV and job description."""
+    parts = [cv_hash, job_hash, model, str(template_version)]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def get_cached_analysis(key: str) -> Optional[Dict]:
+    """Return the cached LLM analysis for a key, or None on a miss.
+
+    Reads go through their own connection, so they never flush, commit or roll back the
+    caller's session; the hit is recorded in the write buffer (see ``flush_cache``).
+    """
+    with _buffer_lock:
+        pending = _pending_stores.get(key)
+    if pending is not None:
+        _count('hits')
+        return json.loads(pending['analysis'])
+    
+    table = AnalysisCacheEntry.__table__
+    try:
+        with db.engine.connect() as conn:
+            row = conn.execute(select(table.c.analysis).where(table.c.key == key)).first()
+        if row is None:
+            _count('misses')
+            return None
+        analysis = json.loads(row.analysis)
+    except Exception as e:
+        logger.warning(f"Analysis cache lookup failed: {str(e)}")
+        _count('errors')
+        return None
+    
+    _count('hits')
+    with _buffer_lock:
+        _pending_hits[key] = _pending_hits.get(key, 0) + 1
+        full = len(_pending_hits) + len(_pending_stores) >= ANALYSIS_CACHE_WRITE_BATCH
+    if full:
+        flush_cache()
+    return analysis
+
+
+def store_analysis(key: str, analysis: Dict, model: str = OLLAMA_MODEL,
+                   template_version: int = CV_ANALYSIS_TEMPLATE_VERSION):
+    """Buffer an LLM analysis for the cache; it is written on the next ``flush_cache``."""
+    now = datetime.now(timezone.utc)
+    with _buffer_lock:
+        _pending_stores[key] = {
+            'key': key,
+            'analysis': json.dumps(analysis),
+            'model': model,
+            'template_version': template_version,
+            'created_at': now,
+            'last_used_at': now,
+            'hit_count': 0
+        }
+        full = len(_pending_hits) + len(_pending_stores) >= ANALYSIS_CACHE_WRITE_BATCH
+    if full:
+        flush_cache()
+
+
+def flush_cache():
+    """Write buffered stores and hit counts in one transaction on a connection of its own.
+
+    Called by the analyzer at the end of every batch. Every ANALYSIS_CACHE_EVICT_EVERY
+    stores, the least recently used entries beyond ANALYSIS_CACHE_MAX_ENTRIES are evicted.
+    """
+    global _stores_since_eviction
+    with _buffer_lock:
+        hits = dict(_pending_hits)
+        stores = list(_pending_stores.values())
+        _pending_hits.clear()
+        _pending_stores.clear()
+    if not hits and not stores:
+        return
+    
+    table = AnalysisCacheEntry.__table__
+    now = datetime.now(timezone.utc)
+    try:
+        with db.engine.begin() as conn:
+            if stores:
+                conn.execute(table.delete().where(table.c.key.in_([row['key'] for row in stores])))
+                conn.execute(table.insert(), stores)
+            if hits:
+                conn.execute(
+                    table.update().where(table.c.key == bindparam('entry_key')).values(
+                        hit_count=table.c.hit_count + bindparam('hits'),
+                        last_used_at=bindparam('used_at')
+                    ),
+                    [{'entry_key': key, 'hits': count, 'used_at': now} for key, count in hits.items()]
+                )
+            _count('stores', len(stores))
+            
+            with _buffer_lock:
+                _stores_since_eviction += len(stores)
+                check = _stores_since_eviction >= ANALYSIS_CACHE_EVICT_EVERY
+                if check:
+                    _stores_since_eviction = 0
+            if check:
+                overflow = conn.execute(select(func.count()).select_from(table)).scalar() - ANALYSIS_CACHE_MAX_ENTRIES
+                if overflow > 0:
+                    oldest = select(table.c.key).order_by(table.c.last_used_at.asc()).limit(overflow)
+                    evicted = conn.execute(table.delete().where(table.c.key.in_(oldest))).rowcount
+                    _count('evictions', evicted)
+    except Exception as e:
+        logger.warning(f"Analysis cache flush failed: {str(e)}")
+        _count('errors')
+
+
+def get_cache_stats() -> Dict:
+    """Get hit/miss counters for this process plus the number of stored entries."""
+    flush_cache()
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+    try:
+        stats['entries'] = AnalysisCacheEntry.query.count()
+    except Exception:
+        stats['entries'] = None
+    stats['max_entries'] = ANALYSIS_CACHE_MAX_ENTRIES
+    return stats
@@ -0,0 +1,133 @@
+"""Adaptive concurrency limit for LLM requests, tuned from observed latency and errors."""
+from contextlib import asynccontextmanager
+from typing import Dict
+import asyncio
+import logging
+import threading
+import time
+from config import (
+    BATCH_SIZE, LLM_MIN_CONCURRENCY, LLM_MAX_CONCURRENCY,
+    LLM_LATENCY_TOLERANCE, LLM_BACKOFF_RATIO
+)
+
+logger = logging.getLogger(__name__)
+
+# Limit learned by the last run, used as the starting point of the next one
+_learned_limit = float(BATCH_SIZE)
+_last_metrics: Dict = {}
+_state_lock = threading.Lock()
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter.
+
+    The limit grows by about one slot per round trip while latency stays close to its
+    long-run average, and is cut multiplicatively when a request fails or when the
+    short-run latency rises above ``latency_tolerance`` times the long-run average
+    (requests are queueing on the model server). Decreases happen at most once per
+    round trip so a burst of slow responses only counts as one congestion signal.
+    """
+
+    def __init__(self, initial: float = None, min_limit: int = LLM_MIN_CONCURRENCY,
+                 max_limit: int = LLM_MAX_CONCURRENCY,
+                 latency_tolerance: float = LLM_LATENCY_TOLERANCE,
+                 backoff_ratio: float = LLM_BACKOFF_RATIO):
+        if initial is None:
+            with _state_lock:
+                initial = _learned_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.decreases = 0
+        self.short_latency = None  # Fast EWMA, reacts to the current load
+        self.long_latency = None  # Slow EWMA, approximates the unloaded latency
+        self._last_decrease = 0.0
+        self._started = time.monotonic()
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of a request."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        start = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            latency = time.monotonic() - start
+            async with self._condition:
+                self.in_flight -= 1
+                self._record(latency, ok)
+                self._condition.notify_all()
+
+    def _record(self, latency: float, ok: bool):
+        """Update latency estimates and adjust the limit after a request completes."""
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+            self._decrease()
+            return
+
+        if self.short_latency is None:
+            self.short_latency = self.long_latency = latency
+        else:
+            self.short_latency = 0.3 * latency + 0.7 * self.short_latency
+            self.long_latency = 0.05 * latency + 0.95 * self.long_latency
+
+        if self.short_latency > self.long_latency * self.latency_tolerance:
+            self._decrease()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < (self.short_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        self.decreases += 1
+
+    def metrics(self) -> Dict:
+        """Get the current limit and the latency/error statistics behind it."""
+        elapsed = time.monotonic() - self._started
+        return {
+            'concurrency_limit': int(self.limit),
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'requests': self.requests,
+            'errors': self.errors,
+            'decreases': self.decreases,
+            'short_latency_seconds': round(self.short_latency, 3) if self.short_latency else None,
+            'long_latency_seconds': round(self.long_latency, 3) if self.long_latency else None,
+            'requests_per_second': round(self.requests / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+    def finish(self):
+        """Remember the learned limit for the next run and publish this run's metrics."""
+        global _learned_limit, _last_metrics
+        metrics = self.metrics()
+        with _state_lock:
+            if self.requests:
+                _learned_limit = self.limit
+            _last_metrics = metrics
+        logger.info(f"LLM run finished: {metrics}")
+
+
+def get_llm_metrics() -> Dict:
+    """Get the metrics of the last LLM run and the limit the next run will start with."""
+    with _state_lock:
+        return {
+            'last_run': dict(_last_metrics),
+            'next_concurrency_limit': int(_learned_limit)
+        }
@@ -1,16 +1,18 @@
-import ollama
-from database.db import db
-from app.models.candidate import Candidate
 import json
 import logging
 import re
-from typing import Dict, List, Union
+from typing import Dict, List
 from config import (
-    OLLAMA_MODEL, OLLAMA_ENDPOINT, MAX_TEXT_LENGTH, BATCH_SIZE,
-    SCORE_WEIGHTS, TECHNICAL_SKILLS, SOFT_SKILLS, CV_ANALYSIS_TEMPLATE
+    OLLAMA_MODEL, OLLAMA_ENDPOINT, MAX_TEXT_LENGTH,
+    OLLAMA_MAX_CONNECTIONS, OLLAMA_MAX_KEEPALIVE_CONNECTIONS, OLLAMA_TIMEOUT, OLLAMA_CONNECT_TIMEOUT,
+    CV_ANALYSIS_TEMPLATE_VERSION, SKILL_TAXONOMY_VERSION
 )
 import asyncio
 import httpx
+from agents.analysis_cache import hashed_cache_key, content_hash, get_cached_analysis, store_analysis, flush_cache
+from agents.concurrency import AdaptiveLimiter
+from agents.skill_matcher import SKILL_MATCHER
+from agents.prompt_builder import build_analysis_prompt, log_prompt_tokens
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -44,20 +46,7 @@ def extract_name_from_cv(cv_text: str) -> str:
 
 def extract_skills(text: str) -> List[str]:
     """Extract both technical and soft skills from text."""
-    text = text.lower()
-    skills = set()
-    
-    # Look for technical skills
-    for skill in TECHNICAL_SKILLS:
-        if skill.lower() in text:
-            skills.add(skill)
-    
-    # Look for soft skills
-    for skill in SOFT_SKILLS:
-        if skill.lower() in text:
-            skills.add(skill)
-    
-    return list(skills)
+    return SKILL_MATCHER.find(text)
 
 def calculate_skill_match(cv_skills: List[str], job_skills: List[str]) -> float:
     """Calculate skill match score between CV and job skills."""
@@ -70,46 +59,165 @@ def calculate_skill_match(cv_skills: List[str], job_skills: List[str]) -> float:
     matches = cv_skills_set.intersection(job_skills_set)
     return len(matches) / len(job_skills_set) if job_skills_set else 0.5
 
-async def analyze_cv_batch(cvs: List[Dict], job_description: str) -> List[Dict]:
-    """Analyze a batch of CVs against a job description."""
-    job_skills = extract_skills(job_description)
+def build_job_profile(job_description: str) -> Dict:
+    """Clean a job description and extract its skills once so it can be scored against many CVs.
+
+    Skills are taken from the whole description; the text sent to the LLM is truncated
+    to MAX_TEXT_LENGTH. Stored jobs keep this in their JobProfile (agents.job_profiles).
+    """
+    description = clean_text(job_description or '')
+    return {
+        'description': description[:MAX_TEXT_LENGTH],
+        'skills': extract_skills(description)
+    }
+
+def job_hash(job_profile: Dict) -> str:
+    """Get the hash identifying a job profile in analysis stamps and cache keys.
+
+    Stored jobs carry one that does not change when their summary becomes ready (see
+    ``agents.job_profiles.prompt_job_hash``); ad hoc profiles are identified by their text.
+    """
+    return job_profile.get('job_hash') or content_hash(job_profile['description'])
+
+def analysis_stamp(job_profile: Dict) -> Dict:
+    """Identify everything an analysis against ``job_profile`` depends on, for ``Candidate.set_analysis``."""
+    return {
+        'job_hash': job_hash(job_profile),
+        'model': OLLAMA_MODEL,
+        'prompt_version': CV_ANALYSIS_TEMPLATE_VERSION,
+        'taxonomy_version': SKILL_TAXONOMY_VERSION
+    }
+
+def skill_only_analysis(cv_skills: List[str], skill_match_score: float,
+                        weakness: str, recommendation: str) -> Dict:
+    """Build an analysis from the skill match alone, used when the LLM is skipped or fails."""
+    return {
+        'match_score': skill_match_score,
+        'score_breakdown': {
+            'essential_skills': skill_match_score,
+            'experience': 0.5,
+            'education': 0.5,
+            'additional': 0.5
+        },
+        'strengths': [f"Has skills: {', '.join(cv_skills[:3])}"] if cv_skills else ["Manual review needed"],
+        'weaknesses': [weakness],
+        'key_skills': cv_skills,
+        'recommendation': recommendation
+    }
+
+def failed_analysis(cv_skills: List[str], skill_match_score: float) -> Dict:
+    """Build the skill-only fallback for a failed LLM analysis, flagged so it is retried on reanalysis."""
+    analysis = skill_only_analysis(
+        cv_skills, skill_match_score,
+        "Automated analysis failed",
+        f"Technical error - but found {len(cv_skills)} matching skills"
+    )
+    analysis['failed'] = True
+    return analysis
+
+def merge_analysis(analysis: Dict, cv_skills: List[str], skill_match_score: float) -> Dict:
+    """Merge a raw LLM analysis with the skill-based score."""
+    # Ensure all required fields exist
+    required_fields = ['match_score', 'strengths', 'weaknesses', 'key_skills', 'recommendation']
+    for field in required_fields:
+        if field not in analysis:
+            analysis[field] = []
+    
+    # Merge skill-based and LLM analysis
+    analysis['match_score'] = round((skill_match_score + float(analysis.get('match_score', 0.5))) / 2, 2)
+    analysis['key_skills'] = list(set(cv_skills))  # Use extracted skills
+    
+    if 'score_breakdown' not in analysis:
+        analysis['score_breakdown'] = {
+            'essential_skills': skill_match_score,
+            'experience': analysis.get('match_score', 0.5),
+            'education': 0.5,
+            'additional': 0.5
+        }
+    
+    return analysis
+
+def create_ollama_client() -> httpx.AsyncClient:
+    """Create a pooled async HTTP client for the Ollama API, shared by every request in a run."""
+    return httpx.AsyncClient(
+        base_url=OLLAMA_ENDPOINT,
+        limits=httpx.Limits(
+            max_connections=OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=OLLAMA_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(OLLAMA_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT)
+    )
+
+async def analyze_cv_batch(cvs: List[Dict], job_profile: Dict,
+                           client: httpx.AsyncClient = None,
+                           limiter: AdaptiveLimiter = None) -> List[Dict]:
+    """Analyze a batch of CVs against a job profile from ``build_job_profile`` or ``get_job_profiles``.
+
+    CVs are dicts with ``cv_text`` and optionally ``candidate_id``, ``name`` and, for
+    stored CV features, the cleaned text's ``skills``.
+
+    All requests share one pooled ``client`` (created for the call if not given). The
+    number of LLM requests in flight is set by ``limiter``, which adapts to the latency
+    and errors of the model server; a slow CV only holds its own slot instead of
+    stalling a whole batch.
+    """
+    job_description = job_profile['description']
+    profile_hash = job_hash(job_profile)
+    job_skills = job_profile['skills']
+    owns_limiter = limiter is None
+    if owns_limiter:
+        limiter = AdaptiveLimiter()
+    owns_client = client is None
+    if owns_client:
+        client = create_ollama_client()
     
     async def process_single_cv(cv_data: Dict) -> Dict:
+        cv_skills = []
+        skill_match_score = 0.0
         try:
-            cv_text = clean_text(cv_data['cv_text'])
-            if len(cv_text) > MAX_TEXT_LENGTH:
-                cv_text = cv_text[:MAX_TEXT_LENGTH]
-            
-            # Extract skills before LLM analysis
-            cv_skills = extract_skills(cv_text)
+            if cv_data.get('skills') is None:
+                cv_text = clean_text(cv_data['cv_text'])
+                # Extract skills before LLM analysis
+                cv_skills = extract_skills(cv_text)
+            else:
+                # Stored CV features: the text is already cleaned
+                cv_text = cv_data['cv_text']
+                cv_skills = cv_data['skills']
             skill_match_score = calculate_skill_match(cv_skills, job_skills)
             
-            # Prepare prompt
-            prompt = CV_ANALYSIS_TEMPLATE % (job_description, cv_text)
+            key = hashed_cache_key(content_hash(cv_text), profile_hash)
+            analysis = get_cached_analysis(key)
             
-            # Get LLM analysis
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{OLLAMA_ENDPOINT}/api/chat",
-                    json={
-                        "model": OLLAMA_MODEL,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert HR recruiter. Return only valid JSON."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ]
-                    }
-                )
+            if analysis is None:
+                # Prepare prompt from the CV sections most relevant to the job
+                prompt, prompt_stats = build_analysis_prompt(cv_text, job_description, job_skills)
                 
-                if response.status_code != 200:
-                    raise Exception(f"API error: {response.status_code}")
+                # Get LLM analysis
+                async with limiter.slot():
+                    response = await client.post(
+                        "/api/chat",
+                        json={
+                            "model": OLLAMA_MODEL,
+                            "stream": False,
+                            "messages": [
+                                {
+                                    "role": "system",
+                                    "content": "You are an expert HR recruiter. Return only valid JSON."
+                                },
+                                {
+                                    "role": "user",
+                                    "content": prompt
+                                }
+                            ]
+                        }
+                    )
+                    
+                    if response.status_code != 200:
+                        raise Exception(f"API error: {response.status_code}")
                 
-                content = response.json()['message']['content'].strip()
+                body = response.json()
+                log_prompt_tokens(prompt_stats, body)
+                content = body['message']['content'].strip()
                 
                 # Extract JSON from response
                 json_match = re.search(r'\{[\s\S]*\}', content)
@@ -117,184 +225,29 @@ async def analyze_cv_batch(cvs: List[Dict], job_description: str) -> List[Dict]:
                     raise ValueError("No JSON found in response")
                 
                 analysis = json.loads(json_match.group(0))
-                
-                # Merge skill-based and LLM analysis
-                analysis['match_score'] = round((skill_match_score + float(analysis['match_score'])) / 2, 2)
-                analysis['key_skills'] = list(set(cv_skills))  # Use extracted skills
-                
-                if 'score_breakdown' not in analysis:
-                    analysis['score_breakdown'] = {
-                        'essential_skills': skill_match_score,
-                        'experience': analysis.get('match_score', 0.5),
-                        'education': 0.5,
-                        'additional': 0.5
-                    }
-                
-                return {
-                    'candidate_id': cv_data.get('candidate_id'),
-                    'name': cv_data.get('name', extract_name_from_cv(cv_text)),
-                    'analysis': analysis
-                }
+                store_analysis(key, analysis)
+            
+            return {
+                'candidate_id': cv_data.get('candidate_id'),
+                'name': cv_data.get('name', extract_name_from_cv(cv_text)),
+                'analysis': merge_analysis(dict(analysis), cv_skills, skill_match_score)
+            }
                 
         except Exception as e:
             logger.error(f"Error analyzing CV: {str(e)}")
             return {
                 'candidate_id': cv_data.get('candidate_id'),
                 'name': cv_data.get('name', "Unknown"),
-                'analysis': {
-                    'match_score': skill_match_score,
-                    'score_breakdown': {
-                        'essential_skills': skill_match_score,
-                        'experience': 0.5,
-                        'education': 0.5,
-                        'additional': 0.5
-                    },
-                    'strengths': [f"Has skills: {', '.join(cv_skills[:3])}"] if cv_skills else ["Manual review needed"],
-                    'weaknesses': ["Automated analysis failed"],
-                    'key_skills': cv_skills,
-                    'recommendation': f"Technical error - but found {len(cv_skills)} matching skills"
-                }
+                'analysis': failed_analysis(cv_skills, skill_match_score)
             }
     
-    # Process CVs in parallel
-    tasks = [process_single_cv(cv) for cv in cvs]
-    results = await asyncio.gather(*tasks)
-    return results
-
-def analyze_cvs(cvs: List[Dict], job_description: str) -> List[Dict]:
-    """Analyze multiple CVs against a job description."""
-    # Clean job description
-    job_description = clean_text(job_description)
-    if len(job_description) > MAX_TEXT_LENGTH:
-        job_description = job_description[:MAX_TEXT_LENGTH]
-    
-    # Process CVs in batches
-    results = []
-    for i in range(0, len(cvs), BATCH_SIZE):
-        batch = cvs[i:i + BATCH_SIZE]
-        batch_results = asyncio.run(analyze_cv_batch(batch, job_description))
-        results.extend(batch_results)
-    
-    return results
-
-def store_candidate(name: str, cv_text: str, job_id: int, analysis: Dict = None) -> Candidate:
-    """Store a candidate in the database with proper error handling."""
-    try:
-        logger.info(f"Storing candidate: {name} for job_id: {job_id}")
-        
-        # If no name provided, try to extract from CV
-        if not name or name.strip() == "":
-            name = extract_name_from_cv(cv_text)
-        
-        # Clean the CV text
-        cv_text = clean_text(cv_text)
-        
-        # Create candidate with safe defaults if analysis is missing
-        candidate = Candidate(
-            name=name,
-            cv_text=cv_text,
-            job_id=job_id,
-            analysis=json.dumps(analysis) if analysis else json.dumps({
-                'match_score': 0.0,
-                'strengths': ["Pending analysis"],
-                'weaknesses': ["Pending analysis"],
-                'key_skills': ["Pending analysis"],
-                'recommendation': "Pending automated analysis"
-            }),
-            match_score=analysis.get('match_score', 0.0) if analysis else 0.0
-        )
-        
-        db.session.add(candidate)
-        db.session.commit()
-        logger.info(f"Successfully stored candidate {name}")
-        return candidate
-        
-    except Exception as e:
-        logger.error(f"Error storing candidate {name}: {str(e)}")
-        db.session.rollback()
-        raise 
-
-def analyze_cv(cv_text: str, job_description: str) -> Dict:
-    """Analyze a single CV against a job description (backward compatibility)."""
+    # Process CVs concurrently, bounded by the adaptive limiter
     try:
-        # Clean and validate inputs
-        cv_text = clean_text(cv_text)
-        job_description = clean_text(job_description)
-        
-        if not cv_text or not job_description:
-            raise ValueError("Empty CV text or job description")
-        
-        # Extract skills before LLM analysis
-        cv_skills = extract_skills(cv_text)
-        job_skills = extract_skills(job_description)
-        skill_match_score = calculate_skill_match(cv_skills, job_skills)
-        
-        # Prepare prompt
-        prompt = CV_ANALYSIS_TEMPLATE % (job_description, cv_text)
-        
-        # Get LLM analysis
-        response = ollama.chat(
-            model=OLLAMA_MODEL,
-            messages=[
-                {
-                    'role': 'system',
-                    'content': 'You are an expert HR recruiter. Return only valid JSON.'
-                },
-                {
-                    'role': 'user',
-                    'content': prompt
-                }
-            ]
-        )
-        
-        if not response or not isinstance(response, dict) or 'message' not in response:
-            raise ValueError("Invalid API response")
-        
-        content = response['message']['content'].strip()
-        
-        # Extract JSON from response
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if not json_match:
-            raise ValueError("No JSON found in response")
-        
-        analysis = json.loads(json_match.group(0))
-        
-        # Validate analysis structure
-        if not isinstance(analysis, dict):
-            raise ValueError("Invalid analysis format")
-        
-        # Ensure all required fields exist
-        required_fields = ['match_score', 'strengths', 'weaknesses', 'key_skills', 'recommendation']
-        for field in required_fields:
-            if field not in analysis:
-                analysis[field] = []
-        
-        # Merge skill-based and LLM analysis
-        analysis['match_score'] = round((skill_match_score + float(analysis.get('match_score', 0.5))) / 2, 2)
-        analysis['key_skills'] = list(set(cv_skills))  # Use extracted skills
-        
-        if 'score_breakdown' not in analysis:
-            analysis['score_breakdown'] = {
-                'essential_skills': skill_match_score,
-                'experience': analysis.get('match_score', 0.5),
-                'education': 0.5,
-                'additional': 0.5
-            }
-        
-        return analysis
-        
-    except Exception as e:
-        logger.error(f"Error in CV analysis: {str(e)}")
-        return {
-            'match_score': skill_match_score,
-            'score_breakdown': {
-                'essential_skills': skill_match_score,
-                'experience': 0.5,
-                'education': 0.5,
-                'additional': 0.5
-            },
-            'strengths': [f"Has skills: {', '.join(cv_skills[:3])}"] if cv_skills else ["Manual review needed"],
-            'weaknesses': ["Automated analysis failed"],
-            'key_skills': cv_skills,
-            'recommendation': f"Technical error - but found {len(cv_skills)} matching skills"
-        } 
\ No newline at end of file
+        tasks = [process_single_cv(cv) for cv in cvs]
+        return await asyncio.gather(*tasks)
+    finally:
+        flush_cache()
+        if owns_limiter:
+            limiter.finish()
+        if owns_client:
+            await client.aclose()
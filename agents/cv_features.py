@@ -0,0 +1,28 @@
+"""Features derived from CV text, computed once at ingest and stored with the candidate."""
+from typing import Dict, Optional
+import re
+from agents.analysis_cache import content_hash
+from agents.cv_analyzer import clean_text, extract_name_from_cv, extract_skills
+from config import SKILL_TAXONOMY_VERSION
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+
+def extract_email(text: str) -> Optional[str]:
+    """Extract the first email address from text."""
+    match = EMAIL_PATTERN.search(text or '')
+    return match.group(0) if match else None
+
+
+def compute_cv_features(raw_text: str) -> Dict:
+    """Clean a CV once and derive everything the analysis, shortlisting and mail paths need."""
+    cv_text = clean_text(raw_text)
+    return {
+        'cv_text': cv_text,
+        'content_hash': content_hash(cv_text),
+        'email': extract_email(cv_text),
+        # Name detection relies on line breaks, which cleaning removes
+        'detected_name': extract_name_from_cv(raw_text),
+        'skills': extract_skills(cv_text),
+        'features_version': SKILL_TAXONOMY_VERSION
+    }
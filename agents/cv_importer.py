@@ -0,0 +1,222 @@
+from database.db import db
+from app.models.job import Job
+from app.models.candidate import Candidate
+from app.models.cv_document import CVDocument
+from agents.cv_analyzer import analysis_stamp
+from agents.cv_features import compute_cv_features
+from agents.job_profiles import get_job_profiles
+from agents.screening import screen_candidate, plan_screening, run_skill_stage, run_llm_stage
+from agents.task_queue import Task
+from agents.pdf_extractor import Upload, extract_pdf_texts
+from typing import Dict, Iterator, List, Optional, Tuple
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def get_or_create_document(features: Dict, file_hash: str = None) -> CVDocument:
+    """Get the stored document with this CV content, creating it if the content is new."""
+    document = CVDocument.query.filter_by(content_hash=features['content_hash']).first()
+    if document is None:
+        document = CVDocument(
+            content_hash=features['content_hash'],
+            file_hash=file_hash,
+            cv_text=features['cv_text']
+        )
+        db.session.add(document)
+        db.session.flush()
+    return document
+
+
+def _document_features(document: CVDocument) -> Dict:
+    """Get the derived features of a stored document, reusing a candidate's copy when current."""
+    candidate = Candidate.query.filter(
+        Candidate.document_id == document.id,
+        Candidate.features_version.isnot(None)
+    ).first()
+    if candidate is not None:
+        candidate.ensure_features()
+        return candidate.get_features()
+    return compute_cv_features(document.cv_text)
+
+
+def _ingest_documents(task: Task, uploads: List[Upload]) -> Iterator[Tuple[str, Optional[CVDocument], Optional[Dict], Optional[str]]]:
+    """Resolve uploads to stored CV documents, parsing only files whose content is new.
+
+    Yields ``(filename, document, features, error)``. Files byte-identical to an earlier
+    file in the same upload are counted on ``task.result['duplicates_skipped']`` and not
+    yielded; files already stored are yielded without being parsed again.
+    """
+    seen = set()
+    pending = []
+    for filename, data in uploads:
+        file_hash = hashlib.sha256(data).hexdigest()
+        if file_hash in seen:
+            task.result['duplicates_skipped'] += 1
+            task.item_done()
+            continue
+        seen.add(file_hash)
+        pending.append((filename, data, file_hash))
+
+    known = {d.file_hash: d for d in CVDocument.query.filter(CVDocument.file_hash.in_(seen))}
+
+    # Parse keyed by content hash, unique within the upload, as filenames may repeat
+    to_parse = []
+    filenames = {}
+    for filename, data, file_hash in pending:
+        document = known.get(file_hash)
+        if document is not None:
+            yield filename, document, _document_features(document), None
+        else:
+            to_parse.append((file_hash, data))
+            filenames[file_hash] = filename
+
+    for file_hash, text, error in extract_pdf_texts(to_parse):
+        filename = filenames[file_hash]
+        if error:
+            yield filename, None, None, error
+            continue
+        features = compute_cv_features(text)
+        yield filename, get_or_create_document(features, file_hash), features, None
+
+
+def _applied_job_ids(content_hash: str) -> set:
+    """Get the ids of jobs that already have a candidate with this CV content."""
+    return {row.job_id for row in db.session.query(Candidate.job_id).filter(Candidate.content_hash == content_hash)}
+
+
+def _llm_stage_for_job(task: Task, job_id: int, job_profile: Dict, stamp: Dict) -> int:
+    """Run screening stage two for a job after an import, leaving outdated candidates to reanalysis."""
+    candidate_ids = plan_screening(job_id, job_profile, stamp, include_outdated=False)['llm_ids']
+    task.add_items(len(candidate_ids))
+    return run_llm_stage(task, candidate_ids, job_profile, stamp)
+
+
+def import_cvs_for_job(task: Task, job_id: int, uploads: List[Upload]):
+    """Background task: parse, screen and store uploaded CVs for one job, then analyze the best with the LLM."""
+    job = Job.query.get(job_id)
+    if not job:
+        raise ValueError(f"Job {job_id} not found")
+    job_profile = get_job_profiles([job.id])[job.id]
+    stamp = analysis_stamp(job_profile)
+    task.result = {'duplicates_skipped': 0, 'llm_analyzed': 0}
+
+    # Files are screened on skills as soon as their text is ready, in completion order
+    for filename, document, features, error in _ingest_documents(task, uploads):
+        try:
+            if error:
+                raise ValueError(error)
+
+            if job.id in _applied_job_ids(features['content_hash']):
+                task.result['duplicates_skipped'] += 1
+                db.session.commit()
+                task.item_done()
+                continue
+
+            candidate = Candidate(name=filename.replace('.pdf', ''), job_id=job_id)
+            candidate.attach_document(document, features)
+            screen_candidate(candidate, features['skills'], job_profile, stamp)
+            db.session.add(candidate)
+            db.session.commit()
+            task.item_done()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error processing file {filename}: {str(e)}")
+            task.item_failed(f"{filename}: {str(e)}")
+
+    processed = task.done
+    task.result['llm_analyzed'] = _llm_stage_for_job(task, job.id, job_profile, stamp)
+    task.message = (f'Successfully processed {processed} CVs '
+                    f'({task.result["duplicates_skipped"]} duplicates skipped, '
+                    f'{task.result["llm_analyzed"]} analyzed by the LLM)')
+
+
+def import_cvs_for_all_jobs(task: Task, uploads: List[Upload]):
+    """Background task: parse each uploaded CV once and screen it against every job, then analyze the best per job."""
+    job_profiles = get_job_profiles()
+    stamps = {job_id: analysis_stamp(profile) for job_id, profile in job_profiles.items()}
+    task.result = {'duplicates_skipped': 0, 'candidates_created': 0, 'llm_analyzed': 0}
+    screened_jobs = set()
+
+    for filename, document, features, error in _ingest_documents(task, uploads):
+        try:
+            if error:
+                raise ValueError(error)
+
+            # Only screen the CV against jobs it has not already been imported for
+            applied = _applied_job_ids(features['content_hash'])
+            new_job_ids = [job_id for job_id in job_profiles if job_id not in applied]
+            task.result['duplicates_skipped'] += len(job_profiles) - len(new_job_ids)
+
+            for job_id in new_job_ids:
+                candidate = Candidate(name=filename.replace('.pdf', ''), job_id=job_id)
+                candidate.attach_document(document, features)
+                screen_candidate(candidate, features['skills'], job_profiles[job_id], stamps[job_id])
+                db.session.add(candidate)
+            db.session.commit()
+            screened_jobs.update(new_job_ids)
+            task.result['candidates_created'] += len(new_job_ids)
+            task.item_done()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error processing file {filename}: {str(e)}")
+            task.item_failed(f"{filename}: {str(e)}")
+
+    processed = task.done
+    for job_id in sorted(screened_jobs):
+        task.result['llm_analyzed'] += _llm_stage_for_job(task, job_id, job_profiles[job_id], stamps[job_id])
+    task.message = (f'Successfully processed {processed} CVs into {task.result["candidates_created"]} candidates '
+                    f'({task.result["duplicates_skipped"]} duplicates skipped, '
+                    f'{task.result["llm_analyzed"]} analyzed by the LLM)')
+
+
+def _job_profile(job_id: int) -> Dict:
+    """Get the analysis profile of one job, raising ValueError if the job does not exist."""
+    profile = get_job_profiles([job_id]).get(job_id)
+    if profile is None:
+        raise ValueError(f"Job {job_id} not found")
+    return profile
+
+
+def plan_reanalysis(job_id: int) -> Dict:
+    """Count what reanalyzing a job would do without doing it.
+
+    Outdated candidates are screened on skills again; the best matches without a current
+    LLM analysis are analyzed by the LLM, at one call each unless the CV and job
+    description pair is already in the analysis cache.
+    """
+    profile = _job_profile(job_id)
+    plan = plan_screening(job_id, profile, analysis_stamp(profile))
+    skill_only = set(plan['outdated_ids']) - set(plan['llm_ids'])
+    return {
+        'job_id': job_id,
+        'candidates': plan['candidates'],
+        'up_to_date': plan['candidates'] - len(plan['outdated_ids']),
+        'outdated': len(plan['outdated_ids']),
+        'skill_only': len(skill_only),
+        'llm_analyses': len(plan['llm_ids']),
+        'cached': plan['cached'],
+        'llm_calls': len(plan['llm_ids']) - plan['cached']
+    }
+
+
+def reanalyze_job_candidates(task: Task, job_id: int):
+    """Background task: bring the screening of a job's candidates up to date.
+
+    A stored analysis is current when it was computed with the job's present description,
+    the configured model, prompt template and skill taxonomy, and the candidate's CV has
+    not changed since (see ``analysis_stamp``). Outdated candidates are screened on skills
+    again, then the best matches without a current LLM analysis go to the LLM.
+    """
+    profile = _job_profile(job_id)
+    stamp = analysis_stamp(profile)
+    plan = plan_screening(job_id, profile, stamp)
+    # Candidates headed for the LLM skip the skill-only pass
+    skill_only = sorted(set(plan['outdated_ids']) - set(plan['llm_ids']))
+    task.add_items(len(skill_only) + len(plan['llm_ids']) - task.total)
+
+    run_skill_stage(task, skill_only, profile, stamp)
+    analyzed = run_llm_stage(task, plan['llm_ids'], profile, stamp)
+    task.result = {'skill_only': len(skill_only), 'llm_analyzed': analyzed}
+    task.message = f'Successfully reanalyzed {task.done} candidates ({analyzed} by the LLM)'
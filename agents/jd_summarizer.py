@@ -1,6 +1,7 @@
 import ollama
 from database.db import db
 from app.models.job import Job
+from agents.job_profiles import ensure_job_profile
 
 def summarize_jd(jd_text):
     """Extract key information from job description using Ollama."""
@@ -29,8 +30,10 @@ def summarize_jd(jd_text):
         return "Error analyzing job description"
 
 def store_jd(title, description):
-    """Store a job description in the database."""
+    """Store a job description in the database along with its analysis profile."""
     job = Job(title=title, description=description)
     db.session.add(job)
+    db.session.flush()
+    ensure_job_profile(job)
     db.session.commit()
     return job 
\ No newline at end of file
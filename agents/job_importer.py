@@ -0,0 +1,116 @@
+"""Streaming job catalog import: chunked parsing, vectorized cleaning and bulk inserts."""
+from database.db import db
+from app.models.job import Job, JOB_TEXT_REPLACEMENTS
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Dict, Iterator, Optional
+import codecs
+import io
+import logging
+import pandas as pd
+from config import JOB_IMPORT_CHUNK_SIZE, JOB_IMPORT_SAMPLE_BYTES, JOB_IMPORT_ENCODINGS
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['Job Title', 'Job Description']
+
+
+class JobImportError(ValueError):
+    """Raised when an uploaded job catalog cannot be read."""
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Pick the first configured encoding that decodes ``sample``.
+
+    The sample may end in the middle of a multi-byte character, so it is decoded
+    incrementally without requiring the final character to be complete.
+    """
+    for encoding in JOB_IMPORT_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise JobImportError('Could not read the CSV file. Please ensure it is properly encoded.')
+
+
+def _read_chunks(stream: BinaryIO, filename: str) -> Iterator[pd.DataFrame]:
+    """Yield the rows of an uploaded CSV or Excel file in DataFrames of JOB_IMPORT_CHUNK_SIZE rows."""
+    if filename.lower().endswith('.csv'):
+        sample = stream.read(JOB_IMPORT_SAMPLE_BYTES)
+        stream.seek(0)
+        encoding = detect_encoding(sample)
+        # Bytes past the sample that do not fit the detected encoding are replaced, not fatal
+        text = io.TextIOWrapper(stream, encoding=encoding, errors='replace', newline='')
+        try:
+            yield from pd.read_csv(text, chunksize=JOB_IMPORT_CHUNK_SIZE, dtype=str)
+        except pd.errors.EmptyDataError:
+            raise JobImportError('The uploaded file is empty')
+        finally:
+            # Leave the upload stream open for its owner
+            text.detach()
+    else:
+        # Excel workbooks cannot be parsed incrementally with the installed readers
+        df = pd.read_excel(stream, dtype=str)
+        for start in range(0, len(df), JOB_IMPORT_CHUNK_SIZE):
+            yield df.iloc[start:start + JOB_IMPORT_CHUNK_SIZE]
+
+
+def _clean_column(column: pd.Series) -> pd.Series:
+    """Strip whitespace and stray quote escaping from a column of job text."""
+    column = column.str.strip()
+    for old, new in JOB_TEXT_REPLACEMENTS:
+        column = column.str.replace(old, new, regex=False)
+    return column
+
+
+def _chunk_to_rows(chunk: pd.DataFrame, created_at: datetime) -> list:
+    """Convert a chunk of catalog rows into Job insert mappings, skipping rows without a description."""
+    chunk = chunk[chunk['Job Description'].notna()]
+    descriptions = _clean_column(chunk['Job Description'])
+    titles = _clean_column(chunk['Job Title'].fillna('Untitled Job'))
+    if 'Requirements' in chunk.columns:
+        requirements = _clean_column(chunk['Requirements'].fillna(chunk['Job Description']))
+    else:
+        requirements = descriptions
+    return [
+        {'title': title, 'description': description, 'requirements': requirement, 'created_at': created_at}
+        for title, description, requirement in zip(titles, descriptions, requirements)
+    ]
+
+
+def import_job_catalog(stream: BinaryIO, filename: str,
+                       on_chunk: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Import jobs from an uploaded catalog without loading the whole file.
+
+    Rows are parsed, cleaned and bulk inserted one chunk at a time, so memory use is
+    bounded by JOB_IMPORT_CHUNK_SIZE. ``on_chunk`` receives the running totals after
+    each chunk. All chunks are committed together at the end.
+    """
+    created_at = datetime.now(timezone.utc)
+    progress = {'chunks': 0, 'rows_read': 0, 'jobs_created': 0, 'rows_skipped': 0}
+
+    try:
+        for chunk in _read_chunks(stream, filename):
+            if progress['chunks'] == 0:
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+                if missing_columns:
+                    raise JobImportError(f'Missing required columns: {", ".join(missing_columns)}')
+
+            rows = _chunk_to_rows(chunk, created_at)
+            if rows:
+                db.session.bulk_insert_mappings(Job, rows)
+
+            progress['chunks'] += 1
+            progress['rows_read'] += len(chunk)
+            progress['jobs_created'] += len(rows)
+            progress['rows_skipped'] += len(chunk) - len(rows)
+            logger.info(f"Job import {filename}: chunk {progress['chunks']}, "
+                        f"{progress['jobs_created']} jobs from {progress['rows_read']} rows")
+            if on_chunk:
+                on_chunk(dict(progress))
+
+        db.session.commit()
+        return progress
+    except Exception:
+        db.session.rollback()
+        raise
@@ -0,0 +1,190 @@
+"""Job profiles: the cleaned description, required skills and summary of a job, computed once and reused by every analysis."""
+from database.db import db
+from app.models.job import Job
+from app.models.job_profile import JobProfile
+from agents.analysis_cache import content_hash
+from agents.cv_analyzer import build_job_profile
+from agents.summarizer import request_job_summary
+from agents.task_queue import Task
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import logging
+from config import (
+    SKILL_TAXONOMY_VERSION, JOB_PROFILE_BATCH_SIZE, JOB_SUMMARIES_ENABLED, JOB_SUMMARY_IN_PROMPT, JOB_PROMPT_VERSION
+)
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_job_profile(job: Job, profile: Optional[JobProfile]) -> Optional[JobProfile]:
+    """Rebuild a job's profile if it is missing or was built from another description or skill taxonomy.
+
+    Returns the new or updated profile, or None if ``profile`` was already current.
+    """
+    description_hash = content_hash(job.description)
+    if (profile is not None and profile.description_hash == description_hash
+            and profile.taxonomy_version == SKILL_TAXONOMY_VERSION):
+        return None
+
+    if profile is None:
+        profile = JobProfile(job_id=job.id)
+        db.session.add(profile)
+    if profile.description_hash != description_hash:
+        # A taxonomy change only affects the skills; a new description needs a new summary
+        profile.summary = None
+        profile.summary_status = 'pending'
+
+    computed = build_job_profile(job.description)
+    profile.description_hash = description_hash
+    profile.description = computed['description']
+    profile.skills = json.dumps(computed['skills'])
+    profile.taxonomy_version = SKILL_TAXONOMY_VERSION
+    profile.updated_at = datetime.now(timezone.utc)
+    return profile
+
+
+def ensure_job_profile(job: Job) -> JobProfile:
+    """Get the current profile of a job, building it first if needed (not committed)."""
+    return refresh_job_profile(job, job.profile) or job.profile
+
+
+def format_summary(summary: Dict) -> str:
+    """Render a stored job summary as compact prompt text."""
+    def as_list(value):
+        return [str(item) for item in value] if isinstance(value, list) else []
+
+    lines = []
+    if summary.get('summary'):
+        lines.append(str(summary['summary']).strip())
+    requirements = as_list(summary.get('key_requirements'))
+    if requirements:
+        lines.append('Key requirements: ' + '; '.join(requirements))
+    responsibilities = as_list(summary.get('key_responsibilities'))
+    if responsibilities:
+        lines.append('Key responsibilities: ' + '; '.join(responsibilities))
+    return '\n'.join(lines)
+
+
+def prompt_description(profile: JobProfile) -> str:
+    """Get the job text sent to the LLM: the summary once ready and shorter, otherwise the cleaned description."""
+    summary = profile.get_summary() if JOB_SUMMARY_IN_PROMPT else None
+    if summary:
+        text = format_summary(summary)
+        if text and len(text) < len(profile.description):
+            return text
+    return profile.description
+
+
+def prompt_job_hash(profile: JobProfile) -> str:
+    """Identify the job as analyses see it: its description plus the configured prompt mode and version.
+
+    The summary becoming ready does not change it, so analyses and cached results made
+    from the full description before then stay valid.
+    """
+    mode = 'summary' if JOB_SUMMARY_IN_PROMPT else 'description'
+    parts = [profile.description_hash, mode, str(JOB_PROMPT_VERSION)]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def get_job_profiles(job_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+    """Get the analysis profiles of the given jobs (all jobs by default) in the format of ``build_job_profile``.
+
+    Profiles are loaded in one query; only missing or stale ones are rebuilt and committed.
+    """
+    query = (
+        db.session.query(Job, JobProfile)
+        .outerjoin(JobProfile, JobProfile.job_id == Job.id)
+        .order_by(Job.id)
+    )
+    if job_ids is not None:
+        query = query.filter(Job.id.in_(list(job_ids)))
+
+    profiles = {}
+    refreshed = 0
+    for job, profile in query:
+        updated = refresh_job_profile(job, profile)
+        if updated is not None:
+            refreshed += 1
+            profile = updated
+        profiles[job.id] = {
+            'description': prompt_description(profile),
+            'skills': profile.get_skills(),
+            'job_hash': prompt_job_hash(profile)
+        }
+    if refreshed:
+        db.session.commit()
+        logger.info(f"Rebuilt {refreshed} job profiles")
+    return profiles
+
+
+def get_stored_job_skills() -> Tuple[Dict[int, List[str]], int]:
+    """Get the stored profile skills of every job without rebuilding anything, for read-only request paths.
+
+    Returns ``(skills, stale)``: skills by job id for jobs with a profile on the current
+    skill taxonomy, and how many jobs have a missing or outdated profile. Descriptions
+    edited since profiling are picked up by ``build_job_profiles``.
+    """
+    rows = (
+        db.session.query(Job.id, JobProfile.skills, JobProfile.taxonomy_version)
+        .outerjoin(JobProfile, JobProfile.job_id == Job.id)
+        .order_by(Job.id)
+    )
+    skills = {}
+    stale = 0
+    for row in rows:
+        if row.skills is None or row.taxonomy_version != SKILL_TAXONOMY_VERSION:
+            stale += 1
+        else:
+            skills[row.id] = json.loads(row.skills)
+    return skills, stale
+
+
+def _profile_stale_jobs() -> int:
+    """Build the profiles of every job that has none or a stale one, a batch at a time. Returns how many were built."""
+    built = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.session.query(Job, JobProfile)
+            .outerjoin(JobProfile, JobProfile.job_id == Job.id)
+            .filter(Job.id > last_id)
+            .order_by(Job.id)
+            .limit(JOB_PROFILE_BATCH_SIZE)
+            .all()
+        )
+        if not rows:
+            return built
+        built += sum(refresh_job_profile(job, profile) is not None for job, profile in rows)
+        last_id = rows[-1][0].id
+        db.session.commit()
+        db.session.expunge_all()
+
+
+def build_job_profiles(task: Task):
+    """Background task: profile new or edited jobs, then generate the pending job summaries."""
+    task.result = {'profiles_built': _profile_stale_jobs(), 'summaries_generated': 0}
+    if not JOB_SUMMARIES_ENABLED:
+        task.message = f'Built {task.result["profiles_built"]} job profiles'
+        return
+
+    pending_ids = [row.id for row in db.session.query(JobProfile.id).filter(JobProfile.summary_status == 'pending')]
+    task.add_items(len(pending_ids) - task.total)
+    for profile_id in pending_ids:
+        profile = JobProfile.query.get(profile_id)
+        try:
+            profile.summary = json.dumps(request_job_summary(profile.description))
+            profile.summary_status = 'ready'
+            db.session.commit()
+            task.result['summaries_generated'] += 1
+            task.item_done()
+        except Exception as e:
+            db.session.rollback()
+            profile.summary_status = 'failed'
+            db.session.commit()
+            logger.error(f"Error summarizing job {profile.job_id}: {str(e)}")
+            task.item_failed(f"Job {profile.job_id}: {str(e)}")
+
+    task.message = (f'Built {task.result["profiles_built"]} job profiles and '
+                    f'{task.result["summaries_generated"]} summaries')
@@ -0,0 +1,170 @@
+"""Paginated, column-projected queries behind the dashboard and list endpoints."""
+from database.db import db
+from app.models.job import Job
+from app.models.candidate import Candidate
+from app.models.shortlisted_candidate import ShortlistedCandidate
+from app.models.analysis_item import AnalysisItem
+from sqlalchemy import func, select
+from typing import Dict, Iterable, Optional
+
+MAX_PER_PAGE = 100
+
+# Filterable and sortable analysis scores, by the name used in the API
+SCORE_COLUMNS = {
+    'match': Candidate.match_score,
+    'essential_skills': Candidate.essential_skills_score,
+    'experience': Candidate.experience_score,
+    'education': Candidate.education_score,
+    'additional': Candidate.additional_score,
+}
+
+
+def _page(query, count_query, page: int, per_page: int) -> Dict:
+    """Run one page of ``query`` and count the matching rows with ``count_query``."""
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+    rows = query.limit(per_page).offset((page - 1) * per_page).all()
+    total = count_query.count()
+    return {
+        'items': [dict(row._mapping) for row in rows],
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page
+    }
+
+
+def get_dashboard_stats() -> Dict:
+    """Get the dashboard totals in a single round trip."""
+    row = db.session.query(
+        select(func.count(Job.id)).scalar_subquery().label('jobs'),
+        select(func.count(Candidate.id)).scalar_subquery().label('candidates'),
+        select(func.count(ShortlistedCandidate.id)).scalar_subquery().label('shortlisted'),
+        select(func.count(ShortlistedCandidate.id))
+        .where(ShortlistedCandidate.status == 'Scheduled')
+        .scalar_subquery().label('scheduled')
+    ).one()
+    return dict(row._mapping)
+
+
+def list_jobs(page: int = 1, per_page: int = 20) -> Dict:
+    """Get a page of jobs, newest first, with their candidate and shortlist counts."""
+    query = (
+        db.session.query(Job.id, Job.title, Job.created_at)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+    )
+    result = _page(query, db.session.query(Job.id), page, per_page)
+
+    # Counts are aggregated for the jobs on this page only
+    job_ids = [item['id'] for item in result['items']]
+    candidate_counts = dict(
+        db.session.query(Candidate.job_id, func.count(Candidate.id))
+        .filter(Candidate.job_id.in_(job_ids)).group_by(Candidate.job_id).all()
+    )
+    shortlisted_counts = dict(
+        db.session.query(ShortlistedCandidate.job_id, func.count(ShortlistedCandidate.id))
+        .filter(ShortlistedCandidate.job_id.in_(job_ids)).group_by(ShortlistedCandidate.job_id).all()
+    )
+    for item in result['items']:
+        item['candidate_count'] = candidate_counts.get(item['id'], 0)
+        item['shortlisted_count'] = shortlisted_counts.get(item['id'], 0)
+    return result
+
+
+def list_candidates(page: int = 1, per_page: int = 20, job_id: Optional[int] = None) -> Dict:
+    """Get a page of candidates, most recent first, without their CV text."""
+    query = (
+        db.session.query(
+            Candidate.id,
+            Candidate.name,
+            Candidate.match_score,
+            Candidate.llm_skipped,
+            Candidate.job_id,
+            Job.title.label('job_title'),
+            Candidate.applied_at,
+            ShortlistedCandidate.status.label('shortlist_status')
+        )
+        .join(Job, Job.id == Candidate.job_id)
+        .outerjoin(ShortlistedCandidate, (ShortlistedCandidate.candidate_id == Candidate.id)
+                   & (ShortlistedCandidate.job_id == Candidate.job_id))
+        .order_by(Candidate.id.desc())  # Ids follow application order and need no sort
+    )
+    count_query = db.session.query(Candidate.id)
+    if job_id is not None:
+        query = query.filter(Candidate.job_id == job_id)
+        count_query = count_query.filter(Candidate.job_id == job_id)
+    return _page(query, count_query, page, per_page)
+
+
+def search_candidates(page: int = 1, per_page: int = 20, job_id: Optional[int] = None,
+                      min_scores: Optional[Dict[str, float]] = None, skills: Iterable[str] = (),
+                      sort: str = 'match') -> Dict:
+    """Get a page of candidates matching minimum analysis scores and key skills, best first.
+
+    ``min_scores`` maps names from SCORE_COLUMNS to lower bounds; every skill in ``skills``
+    must be among the candidate's analysed key skills (case-insensitive).
+    """
+    if sort not in SCORE_COLUMNS:
+        raise ValueError(f"Unknown sort '{sort}', expected one of {', '.join(SCORE_COLUMNS)}")
+    conditions = []
+    if job_id is not None:
+        conditions.append(Candidate.job_id == job_id)
+    for name, minimum in (min_scores or {}).items():
+        if name not in SCORE_COLUMNS:
+            raise ValueError(f"Unknown score '{name}', expected one of {', '.join(SCORE_COLUMNS)}")
+        conditions.append(SCORE_COLUMNS[name] >= minimum)
+    for skill in skills:
+        conditions.append(
+            select(AnalysisItem.id).where(
+                AnalysisItem.candidate_id == Candidate.id,
+                AnalysisItem.kind == 'skill',
+                AnalysisItem.normalized == AnalysisItem.normalize(skill)
+            ).exists()
+        )
+
+    query = (
+        db.session.query(
+            Candidate.id,
+            Candidate.name,
+            Candidate.job_id,
+            Candidate.llm_skipped,
+            *(column.label(f'{name}_score') for name, column in SCORE_COLUMNS.items())
+        )
+        .filter(*conditions)
+        .order_by(SCORE_COLUMNS[sort].desc(), Candidate.id)
+    )
+    return _page(query, db.session.query(Candidate.id).filter(*conditions), page, per_page)
+
+
+def list_upcoming_interviews(page: int = 1, per_page: int = 20) -> Dict:
+    """Get a page of scheduled interviews in date order."""
+    query = (
+        db.session.query(
+            ShortlistedCandidate.id,
+            ShortlistedCandidate.interview_date,
+            ShortlistedCandidate.meeting_link,
+            ShortlistedCandidate.interview_duration,
+            ShortlistedCandidate.panel,
+            Candidate.id.label('candidate_id'),
+            Candidate.name.label('candidate_name'),
+            Candidate.match_score,
+            Job.title.label('job_title')
+        )
+        .join(Candidate, Candidate.id == ShortlistedCandidate.candidate_id)
+        .join(Job, Job.id == ShortlistedCandidate.job_id)
+        .filter(ShortlistedCandidate.status == 'Scheduled', ShortlistedCandidate.interview_date.isnot(None))
+        .order_by(ShortlistedCandidate.interview_date)
+    )
+    count_query = db.session.query(ShortlistedCandidate.id).filter(
+        ShortlistedCandidate.status == 'Scheduled', ShortlistedCandidate.interview_date.isnot(None)
+    )
+    return _page(query, count_query, page, per_page)
+
+
+def serialize_page(result: Dict) -> Dict:
+    """Convert the datetimes of a page to ISO format for a JSON response."""
+    items = [
+        {key: value.isoformat() if hasattr(value, 'isoformat') else value for key, value in item.items()}
+        for item in result['items']
+    ]
+    return dict(result, items=items)
@@ -0,0 +1,158 @@
+"""Interview invite emails, sent in bulk over pooled SMTP connections from a background task."""
+from app import mail
+from app.models.candidate import Candidate
+from agents.task_queue import Task
+from flask import current_app
+from flask_mail import Message
+from typing import Callable, Dict, List, Optional
+import logging
+import smtplib
+import time
+from config import MAIL_BATCH_SIZE, MAIL_MAX_ATTEMPTS, MAIL_RETRY_BACKOFF
+
+logger = logging.getLogger(__name__)
+
+
+def build_invite_message(name: str, email: str, meeting_data: Dict) -> Message:
+    """Build the interview invite email for one candidate."""
+    company = current_app.config.get('COMPANY_NAME', 'Our')
+    subject = f"Interview Invitation - {company}"
+
+    body = f"""Dear {name},
+
+We are pleased to invite you for an interview for the position you applied for.
+
+Interview Details:
+Date & Time: {meeting_data['meetingDate']}
+Duration: {meeting_data['meetingDuration']} minutes
+Meeting Link: {meeting_data['meetingLink']}
+
+{meeting_data.get('additionalNotes', '')}
+
+Please confirm your attendance by clicking the meeting link at the scheduled time.
+
+Best regards,
+{company} Recruitment Team
+"""
+
+    return Message(subject=subject, recipients=[email], body=body)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Refused recipients, 5xx replies and malformed messages fail the same way again; anything else is retried."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return not isinstance(error, (smtplib.SMTPException, OSError))
+
+
+def _send_batch(items: List[Dict], attempt: int, final: bool,
+                on_result: Optional[Callable[[Dict], None]]) -> List[Dict]:
+    """Send a batch of messages over one SMTP connection and return the items to retry."""
+    retry = []
+
+    def finish(item: Dict, status: str, error: Exception = None):
+        item['status'] = status
+        item['error'] = str(error) if error else None
+        if on_result:
+            on_result(item)
+
+    def fail(item: Dict, error: Exception):
+        if final or _is_permanent(error):
+            finish(item, 'failed', error)
+        else:
+            item['error'] = str(error)
+            retry.append(item)
+
+    for item in items:
+        item['attempts'] = attempt
+    unsent = list(items)
+    try:
+        with mail.connect() as connection:
+            while unsent:
+                item = unsent.pop(0)
+                try:
+                    connection.send(item['message'])
+                except smtplib.SMTPServerDisconnected:
+                    # The rest of the batch needs a new connection
+                    unsent.insert(0, item)
+                    raise
+                except Exception as e:
+                    fail(item, e)
+                    continue
+                finish(item, 'sent')
+    except (smtplib.SMTPException, OSError) as e:
+        # Connecting failed or the session dropped; quit() on a dead session lands here too
+        logger.warning(f"SMTP connection error: {str(e)}")
+        for item in unsent:
+            fail(item, e)
+    return retry
+
+
+def send_messages(items: List[Dict], on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    """Send messages in batches of MAIL_BATCH_SIZE, one SMTP connection per batch.
+
+    Each item is a dict holding a flask_mail ``message`` plus any fields identifying the
+    recipient. Transient failures are retried up to MAIL_MAX_ATTEMPTS times in total,
+    waiting MAIL_RETRY_BACKOFF seconds before the second attempt and doubling the wait
+    after that. Items are updated in place with their ``status`` ('sent' or 'failed'),
+    ``attempts`` and last ``error``, passed to ``on_result`` as they finish, and returned.
+    """
+    for item in items:
+        item.update(status=None, attempts=0, error=None)
+
+    pending = list(items)
+    for attempt in range(1, MAIL_MAX_ATTEMPTS + 1):
+        if attempt > 1:
+            delay = MAIL_RETRY_BACKOFF * 2 ** (attempt - 2)
+            logger.info(f"Retrying {len(pending)} emails in {delay:.1f}s (attempt {attempt}/{MAIL_MAX_ATTEMPTS})")
+            time.sleep(delay)
+        final = attempt == MAIL_MAX_ATTEMPTS
+        retry = []
+        for start in range(0, len(pending), MAIL_BATCH_SIZE):
+            retry.extend(_send_batch(pending[start:start + MAIL_BATCH_SIZE], attempt, final, on_result))
+        pending = retry
+        if not pending:
+            break
+    return items
+
+
+def send_interview_invites(task: Task, invites: List[Dict]):
+    """Background task: email interview invites, given as ``{'candidate_id', 'meeting_data'}`` dicts."""
+    candidates = {c.id: c for c in Candidate.query.filter(Candidate.id.in_([i['candidate_id'] for i in invites]))}
+    task.result = {'sent': 0, 'failed': 0, 'recipients': []}
+
+    def record(item: Dict):
+        result = {key: item.get(key) for key in ('candidate_id', 'name', 'email', 'status', 'attempts', 'error')}
+        task.result['recipients'].append(result)
+        if item['status'] == 'sent':
+            task.result['sent'] += 1
+            task.item_done()
+        else:
+            task.result['failed'] += 1
+            task.item_failed(f"{item.get('name') or item['candidate_id']}: {item['error']}")
+
+    items = []
+    for invite in invites:
+        candidate = candidates.get(invite['candidate_id'])
+        item = {'candidate_id': invite['candidate_id'], 'name': None, 'email': None,
+                'status': 'failed', 'attempts': 0, 'error': None}
+        if candidate is None:
+            item['error'] = 'Candidate not found'
+        else:
+            item['name'] = candidate.name
+            try:
+                item['email'] = candidate.extract_email()
+            except Exception as e:
+                logger.error(f"Error reading email of candidate {candidate.id}: {str(e)}")
+            if not item['email']:
+                item['error'] = 'No email found in CV'
+        if item['error']:
+            record(item)
+            continue
+        item['message'] = build_invite_message(item['name'], item['email'], invite['meeting_data'])
+        items.append(item)
+
+    send_messages(items, on_result=record)
+    task.message = f'Sent {task.result["sent"]} of {len(invites)} invites ({task.result["failed"]} failed)'
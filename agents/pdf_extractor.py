@@ -0,0 +1,147 @@
+"""Parallel PDF text extraction on a process pool with a per-file timeout and page cap."""
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
+import io
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import threading
+from PyPDF2 import PdfReader
+from config import PDF_WORKERS, PDF_TIMEOUT, PDF_MAX_PAGES
+
+logger = logging.getLogger(__name__)
+
+# An uploaded file as (filename, raw bytes)
+Upload = Tuple[str, bytes]
+
+_pool = None
+_pool_lock = threading.Lock()
+# Queue each pool's workers report their pid on at startup, so a reset can kill them
+_worker_pids = {}
+
+
+class PdfTimeoutError(Exception):
+    """Raised when a PDF takes longer than PDF_TIMEOUT seconds to extract."""
+
+
+def _raise_timeout(signum, frame):
+    raise PdfTimeoutError("Extraction timed out")
+
+
+def extract_pdf_text(data: bytes, max_pages: int = PDF_MAX_PAGES,
+                     timeout: float = PDF_TIMEOUT) -> str:
+    """Extract the text of the first ``max_pages`` pages of a PDF.
+
+    Runs inside a pool worker, where an interval timer interrupts files that take longer
+    than ``timeout`` seconds (on platforms without SIGALRM the pool-level deadline in
+    ``extract_pdf_texts`` still applies).
+    """
+    use_alarm = hasattr(signal, 'SIGALRM') and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        pages = []
+        for i in range(min(len(reader.pages), max_pages)):
+            pages.append(reader.pages[i].extract_text() or "")
+        return "\n".join(pages)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _report_pid(pids):
+    """Pool worker initializer: tell the parent this worker's pid."""
+    pids.put(os.getpid())
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn keeps workers free of locks and connections held by the Flask threads
+            context = multiprocessing.get_context('spawn')
+            pids = context.SimpleQueue()
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=context,
+                                        initializer=_report_pid, initargs=(pids,))
+            _worker_pids[_pool] = pids
+        return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor):
+    """Replace a stuck or broken pool so later uploads get fresh processes, killing its workers.
+
+    shutdown() alone would leave a worker stuck in a pathological PDF running forever.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+        pids = _worker_pids.pop(pool, None)
+    pool.shutdown(wait=False, cancel_futures=True)
+    if pids is None:
+        return
+    worker_pids = set()
+    while not pids.empty():
+        worker_pids.add(pids.get())
+    # Only live children of this process, so a pid reused after a worker died is never hit
+    for process in multiprocessing.active_children():
+        if process.pid in worker_pids:
+            process.terminate()
+
+
+def extract_pdf_texts(uploads: List[Upload]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """Extract uploaded PDFs in parallel, yielding ``(filename, text, error)`` as each finishes.
+
+    ``text`` is None when the file could not be read, timed out or contained no text, in
+    which case ``error`` says why.
+    """
+    if not uploads:
+        return
+
+    pool = _get_pool()
+    try:
+        futures = {pool.submit(extract_pdf_text, data): filename for filename, data in uploads}
+    except BrokenProcessPool:
+        # A worker died during an earlier upload; retry once on a fresh pool
+        _reset_pool(pool)
+        pool = _get_pool()
+        futures = {pool.submit(extract_pdf_text, data): filename for filename, data in uploads}
+    # Backstop for workers the in-process timer could not interrupt
+    deadline = PDF_TIMEOUT * (math.ceil(len(futures) / PDF_WORKERS) + 1)
+    reported = set()
+
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            reported.add(future)
+            yield _outcome(futures[future], future)
+    except FuturesTimeout:
+        for future, filename in futures.items():
+            if future in reported:
+                continue
+            if future.done():
+                yield _outcome(filename, future)
+            else:
+                future.cancel()
+                yield filename, None, f"Extraction did not finish within {deadline}s"
+        _reset_pool(pool)
+        return
+
+    if any(isinstance(f.exception(), BrokenProcessPool) for f in futures):
+        _reset_pool(pool)
+
+
+def _outcome(filename: str, future) -> Tuple[str, Optional[str], Optional[str]]:
+    """Turn a finished extraction future into a ``(filename, text, error)`` result."""
+    try:
+        text = future.result()
+    except Exception as e:
+        logger.error(f"Error reading PDF {filename}: {str(e)}")
+        return filename, None, str(e) or type(e).__name__
+    if not text or not text.strip():
+        return filename, None, "No text could be extracted"
+    return filename, text, None
@@ -0,0 +1,160 @@
+"""Compact LLM analysis prompts: the CV sections most relevant to a job, packed into a token budget."""
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import math
+import re
+from agents.skill_matcher import SKILL_MATCHER
+from config import (
+    CV_ANALYSIS_TEMPLATE, PROMPT_CHARS_PER_TOKEN, PROMPT_CV_TOKEN_BUDGET,
+    PROMPT_JD_TOKEN_BUDGET, PROMPT_SEGMENT_CHARS
+)
+
+logger = logging.getLogger(__name__)
+
+# Common CV headings and how much being in that section counts towards relevance,
+# on top of one point per required job skill a segment mentions
+SECTION_PRIORITY = {
+    'Work Experience': 1.0, 'Professional Experience': 1.0, 'Employment History': 1.0,
+    'Work History': 1.0, 'Experience': 1.0,
+    'Projects': 0.75, 'Technical Skills': 0.75, 'Skills': 0.75,
+    'Professional Summary': 0.5, 'Summary': 0.5, 'Profile': 0.5, 'Objective': 0.25,
+    'Education': 0.5, 'Certifications': 0.5, 'Qualifications': 0.5,
+    'Achievements': 0.25, 'Awards': 0.25, 'Publications': 0.25,
+    'Languages': 0.0, 'Interests': 0.0, 'Hobbies': 0.0, 'References': 0.0,
+}
+LEAD_PRIORITY = 0.25  # Text before the first heading: name, contact details, headline
+
+# CV text is stored with line breaks collapsed, so headings are recognised as Title Case
+# or UPPER CASE words followed by a colon, a capitalised word or the end of the text.
+# Lower case matches ("years of experience in") are ordinary sentences.
+_HEADINGS = sorted(SECTION_PRIORITY, key=len, reverse=True)
+_HEADING_PATTERN = re.compile(
+    r'(?<![A-Za-z])(' + '|'.join(re.escape(h) for h in _HEADINGS)
+    + '|' + '|'.join(re.escape(h.upper()) for h in _HEADINGS)
+    + r')(?=\s*:|\s+[A-Z0-9]|\s*$)'
+)
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?;])\s+|\s+(?=[•·▪●]|-\s)')
+_JD_SENTENCE_END = re.compile(r'[.!?;](?=\s)')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in ``text`` from its length."""
+    return math.ceil(len(text or '') / PROMPT_CHARS_PER_TOKEN)
+
+
+def _split_long(text: str, limit: int) -> List[str]:
+    """Split text into pieces of at most ``limit`` characters, at sentence boundaries where possible."""
+    pieces = []
+    current = ''
+    for sentence in _SENTENCE_BREAK.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > limit:
+            # A run-on sentence is cut at the last space that fits
+            cut = sentence.rfind(' ', 0, limit)
+            cut = cut if cut > 0 else limit
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > limit:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f'{current} {sentence}' if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def segment_cv(cv_text: str) -> List[Dict]:
+    """Split a cleaned CV into segments of at most PROMPT_SEGMENT_CHARS characters, one section or part of one each.
+
+    Each segment records its position, section heading, text, estimated tokens and the skills it mentions.
+    """
+    sections = []
+    start, heading = 0, None
+    for match in _HEADING_PATTERN.finditer(cv_text or ''):
+        sections.append((heading, cv_text[start:match.start()]))
+        start, heading = match.start(), match.group(1)
+    sections.append((heading, (cv_text or '')[start:]))
+
+    segments = []
+    for heading, text in sections:
+        canonical = next((h for h in SECTION_PRIORITY if h.upper() == heading.upper()), None) if heading else None
+        for piece in _split_long(text.strip(), PROMPT_SEGMENT_CHARS):
+            segments.append({
+                'position': len(segments),
+                'section': canonical,
+                'text': piece,
+                'tokens': estimate_tokens(piece),
+                'skills': set(SKILL_MATCHER.find(piece))
+            })
+    return segments
+
+
+def pack_segments(segments: List[Dict], job_skills: Iterable[str], budget: int) -> List[Dict]:
+    """Pick the segments most relevant to ``job_skills`` that fit in ``budget`` tokens, in CV order."""
+    if sum(segment['tokens'] for segment in segments) <= budget:
+        return list(segments)
+
+    job_skills = set(job_skills)
+
+    def relevance(segment: Dict) -> float:
+        priority = SECTION_PRIORITY[segment['section']] if segment['section'] else LEAD_PRIORITY
+        return len(segment['skills'] & job_skills) + priority
+
+    chosen = []
+    remaining = budget
+    for segment in sorted(segments, key=lambda s: (-relevance(s), s['position'])):
+        if segment['tokens'] <= remaining:
+            chosen.append(segment)
+            remaining -= segment['tokens']
+    return sorted(chosen, key=lambda s: s['position'])
+
+
+def compact_job_description(job_description: str, budget: int = PROMPT_JD_TOKEN_BUDGET) -> str:
+    """Cut a job description down to ``budget`` tokens, ending on a sentence boundary where possible."""
+    limit = budget * PROMPT_CHARS_PER_TOKEN
+    if len(job_description) <= limit:
+        return job_description
+    ends = [match.end() for match in _JD_SENTENCE_END.finditer(job_description, 0, limit)]
+    return job_description[:ends[-1]] if ends else job_description[:limit]
+
+
+def build_analysis_prompt(cv_text: str, job_description: str, job_skills: Iterable[str],
+                          segments: Optional[List[Dict]] = None) -> Tuple[str, Dict]:
+    """Build the CV analysis prompt from the job description and the CV sections most relevant to the job.
+
+    ``segments`` may be passed in when one CV is scored against several jobs, so it is
+    segmented only once. Returns the prompt and its token statistics.
+    """
+    if segments is None:
+        segments = segment_cv(cv_text)
+    chosen = pack_segments(segments, job_skills, PROMPT_CV_TOKEN_BUDGET)
+    cv_content = '\n'.join(segment['text'] for segment in chosen)
+    job_description = compact_job_description(job_description)
+
+    prompt = CV_ANALYSIS_TEMPLATE % (job_description, cv_content)
+    stats = {
+        'prompt_tokens': estimate_tokens(prompt),
+        'job_tokens': estimate_tokens(job_description),
+        'cv_tokens': estimate_tokens(cv_content),
+        'cv_tokens_available': sum(segment['tokens'] for segment in segments),
+        'cv_segments': len(chosen),
+        'cv_segments_available': len(segments)
+    }
+    return prompt, stats
+
+
+def log_prompt_tokens(stats: Dict, response: Optional[Dict] = None):
+    """Log the estimated prompt size and, when the model reports it, the prompt tokens it evaluated."""
+    evaluated = response.get('prompt_eval_count') if hasattr(response, 'get') else None
+    logger.info(
+        f"Analysis prompt: ~{stats['prompt_tokens']} tokens estimated"
+        f"{f', {evaluated} evaluated by the model' if evaluated is not None else ''} "
+        f"(job ~{stats['job_tokens']}, CV ~{stats['cv_tokens']} of {stats['cv_tokens_available']} "
+        f"in {stats['cv_segments']}/{stats['cv_segments_available']} segments)"
+    )
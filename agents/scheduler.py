@@ -1,32 +1,154 @@
 from database.db import db
+from app.models.candidate import Candidate
 from app.models.shortlisted_candidate import ShortlistedCandidate
+from flask import current_app
 from datetime import datetime, timezone, timedelta
+from typing import Dict, Iterable, List
+import random
+from agents.slot_allocator import SlotAllocator
+from config import INTERVIEW_DEFAULT_DURATION
+
+# Both spellings are in use for booked interviews
+SCHEDULED_STATUSES = ('Scheduled', 'scheduled')
+
+MEETING_ID_ALPHABET = 'abcdefghijkmnpqrstuvwxyz23456789'
+
+def generate_meeting_link():
+    """Generate a unique Google Meet-like meeting link."""
+    meeting_id = ''.join(random.choices(MEETING_ID_ALPHABET, k=10))
+    return f"https://meet.google.com/{meeting_id}"
+
+def load_allocator(start: datetime, exclude_ids: Iterable[int] = ()) -> SlotAllocator:
+    """Build a slot allocator holding every interview booked from the day before ``start`` on, for all jobs.
+
+    Interviews whose shortlist ids are in ``exclude_ids`` are left out so they can be moved.
+    """
+    exclude_ids = set(exclude_ids)
+    allocator = SlotAllocator()
+    booked = (
+        db.session.query(ShortlistedCandidate.id, ShortlistedCandidate.interview_date,
+                         ShortlistedCandidate.interview_duration, ShortlistedCandidate.panel)
+        .filter(ShortlistedCandidate.status.in_(SCHEDULED_STATUSES),
+                ShortlistedCandidate.interview_date >= start - timedelta(days=1))
+        .order_by(ShortlistedCandidate.interview_date)
+    )
+    for row in booked:
+        if row.id not in exclude_ids:
+            allocator.block(row.interview_date, row.interview_duration or INTERVIEW_DEFAULT_DURATION, row.panel)
+    return allocator
+
+def invite_meeting_data(name: str, slot: datetime, duration: int, meeting_link: str, additional_notes: str = '') -> Dict:
+    """Build the meeting details emailed to a candidate with their interview invite."""
+    # Format the email with personalized message
+    personalized_notes = additional_notes.replace('{name}', name)
+    
+    return {
+        'meetingDate': slot.strftime('%Y-%m-%d %H:%M'),
+        'meetingDuration': duration,
+        'meetingLink': meeting_link,
+        'additionalNotes': f"""Dear {name},
+
+We are pleased to invite you for an interview. Your interview has been scheduled for:
+
+Date: {slot.strftime('%A, %B %d, %Y')}
+Time: {slot.strftime('%I:%M %p')}
+Duration: {duration} minutes
+
+Meeting Link: {meeting_link}
+
+{personalized_notes}
+
+Please ensure you:
+1. Test your audio and video before the interview
+2. Join the meeting 5 minutes early
+3. Have a stable internet connection
+4. Keep your CV and portfolio ready
+
+If you need to reschedule, please contact us at least 24 hours before the interview.
+
+Best regards,
+{current_app.config.get('COMPANY_NAME', 'Our')} Recruitment Team"""
+    }
+
+def schedule_candidates(job_id: int, candidate_ids: List[int], start: datetime, duration: int,
+                        break_duration: int, additional_notes: str = '') -> Dict:
+    """Schedule interviews for the chosen candidates of a job, best match first.
+
+    Candidates and their shortlist rows are fetched in one query, every slot is allocated
+    up front around the interviews already booked for any job, within business hours and
+    across the interview panels, and the shortlist rows are updated (or created for
+    candidates that have none) in bulk and one commit, so every invited slot is saved.
+    Raises SlotConflictError if no free slots are left.
+    Sending the invites is left to the caller: the returned ``invites`` are ready for
+    ``agents.mailer.send_interview_invites``.
+    """
+    rows = (
+        db.session.query(Candidate.id, Candidate.name, ShortlistedCandidate.id.label('shortlist_id'))
+        .outerjoin(ShortlistedCandidate, (ShortlistedCandidate.candidate_id == Candidate.id)
+                   & (ShortlistedCandidate.job_id == job_id))
+        .filter(Candidate.id.in_(candidate_ids), Candidate.job_id == job_id)
+        .order_by(Candidate.match_score.desc(), Candidate.id)
+        .all()
+    )
+    # Candidates being moved do not block their own new slots
+    allocator = load_allocator(start, exclude_ids=[row.shortlist_id for row in rows if row.shortlist_id])
+    slots = allocator.allocate(len(rows), start, duration, break_duration)
+    
+    updates = []
+    inserts = []
+    invites = []
+    now = datetime.now(timezone.utc)
+    for row, (slot, panel) in zip(rows, slots):
+        meeting_link = generate_meeting_link()
+        booking = {
+            'interview_date': slot,
+            'interview_duration': duration,
+            'panel': panel,
+            'status': 'Scheduled',
+            'meeting_link': meeting_link
+        }
+        if row.shortlist_id is not None:
+            updates.append(dict(booking, id=row.shortlist_id))
+        else:
+            # Candidates scheduled without being shortlisted first get their row here, so the slot stays booked
+            inserts.append(dict(booking, candidate_id=row.id, job_id=job_id, shortlisted_at=now))
+        invites.append({
+            'candidate_id': row.id,
+            'meeting_data': invite_meeting_data(row.name, slot, duration, meeting_link, additional_notes)
+        })
+    
+    try:
+        db.session.bulk_update_mappings(ShortlistedCandidate, updates)
+        db.session.bulk_insert_mappings(ShortlistedCandidate, inserts)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    return {'scheduled': len(rows), 'updated': len(updates), 'created': len(inserts), 'invites': invites}
 
 def schedule_interviews(job_id):
     """Schedule interviews for shortlisted candidates."""
     # Get all shortlisted candidates without interview dates
-    candidates = ShortlistedCandidate.query.filter_by(
+    shortlist_ids = [row.id for row in db.session.query(ShortlistedCandidate.id).filter_by(
         job_id=job_id,
         interview_date=None,
         status='pending'
-    ).all()
+    ).order_by(ShortlistedCandidate.id)]
     
-    if not candidates:
+    if not shortlist_ids:
         return 0
     
-    # Start scheduling from tomorrow
-    interview_date = datetime.now(timezone.utc).replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
-    count = 0
-    
-    for candidate in candidates:
-        # Schedule 1-hour interviews
-        candidate.interview_date = interview_date
-        candidate.status = 'scheduled'
-        interview_date += timedelta(hours=1)
-        count += 1
+    # Start scheduling from tomorrow, with 1-hour interviews in the free slots of every panel
+    start = datetime.now(timezone.utc).replace(hour=9, minute=0, second=0, microsecond=0, tzinfo=None) + timedelta(days=1)
+    slots = load_allocator(start).allocate(len(shortlist_ids), start, 60)
     
+    db.session.bulk_update_mappings(ShortlistedCandidate, [
+        {'id': shortlist_id, 'interview_date': slot, 'interview_duration': 60, 'panel': panel, 'status': 'scheduled'}
+        for shortlist_id, (slot, panel) in zip(shortlist_ids, slots)
+    ])
     db.session.commit()
-    return count
+    return len(shortlist_ids)
 
 def get_scheduled_interviews(job_id):
     """Get all scheduled interviews for a job."""
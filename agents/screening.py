@@ -0,0 +1,191 @@
+"""Two-stage candidate screening: a skill match for every candidate, an LLM analysis only for the best per job.
+
+Stage one scores a CV against the job's skills and stores a skill-only analysis marked
+``llm_skipped``. Stage two sends the candidates with at least PREFILTER_MIN_SKILL_MATCH
+that rank within the job's top SCREENING_TOP_K skill matches to the LLM.
+"""
+from database.db import db
+from app.models.candidate import Candidate
+from app.models.analysis_cache import AnalysisCacheEntry
+from agents.analysis_cache import hashed_cache_key
+from agents.concurrency import AdaptiveLimiter
+from agents.cv_analyzer import analyze_cv_batch, calculate_skill_match, create_ollama_client, skill_only_analysis
+from agents.task_queue import Task
+from typing import Dict, List, Optional
+import asyncio
+import json
+import logging
+from config import PREFILTER_MIN_SKILL_MATCH, SCREENING_TOP_K, REANALYSIS_BATCH_SIZE, SKILL_TAXONOMY_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def screened_analysis(cv_skills: List[str], skill_match_score: float) -> Dict:
+    """Build the stage one analysis of a candidate, marked as not analyzed by the LLM."""
+    if skill_match_score < PREFILTER_MIN_SKILL_MATCH:
+        weakness = "Low skill overlap with job requirements"
+    else:
+        weakness = "Screened on skill match only"
+    analysis = skill_only_analysis(
+        cv_skills, skill_match_score, weakness,
+        f"Skipped detailed analysis - {skill_match_score:.0%} of the required skills found"
+    )
+    analysis['llm_skipped'] = True
+    return analysis
+
+
+def screen_candidate(candidate: Candidate, cv_skills: List[str], job_profile: Dict, stamp: Dict):
+    """Stage one: score a candidate on skills alone and store the skill-only analysis."""
+    candidate.skill_match_score = calculate_skill_match(cv_skills, job_profile['skills'])
+    candidate.set_analysis(screened_analysis(cv_skills, candidate.skill_match_score), stamp)
+
+
+def refresh_stale_features(job_id: Optional[int] = None, task: Optional[Task] = None) -> int:
+    """Recompute and store the features of candidates whose CV or skill taxonomy changed, a batch at a time.
+
+    Covers one job's candidates, or every candidate if ``job_id`` is None. Returns how many were refreshed.
+    """
+    query = db.session.query(Candidate.id).filter(Candidate.features_version.is_distinct_from(SKILL_TAXONOMY_VERSION))
+    if job_id is not None:
+        query = query.filter(Candidate.job_id == job_id)
+    candidate_ids = [row.id for row in query.order_by(Candidate.id)]
+    if task is not None:
+        task.add_items(len(candidate_ids) - task.total)
+    for start in range(0, len(candidate_ids), REANALYSIS_BATCH_SIZE):
+        batch = Candidate.with_content().filter(Candidate.id.in_(candidate_ids[start:start + REANALYSIS_BATCH_SIZE])).all()
+        for candidate in batch:
+            candidate.ensure_features()
+        db.session.commit()
+        if task is not None:
+            task.item_done(len(batch))
+    return len(candidate_ids)
+
+
+def refresh_features(task: Task):
+    """Background task: bring the stored CV features of every candidate up to date."""
+    refreshed = refresh_stale_features(task=task)
+    task.message = f'Refreshed the CV features of {refreshed} candidates'
+
+
+def plan_screening(job_id: int, job_profile: Dict, stamp: Dict, include_outdated: bool = True,
+                   top_k: Optional[int] = SCREENING_TOP_K,
+                   min_skill_match: float = PREFILTER_MIN_SKILL_MATCH) -> Dict:
+    """Work out which candidates of a job each screening stage has to process.
+
+    Nothing is analyzed, but stale CV features are recomputed and stored first (see
+    ``refresh_stale_features``) so candidates are ranked on current skills. Returns the
+    ids of candidates whose analysis is outdated (stage one) and of those that need an
+    LLM analysis (stage two), plus how many of the latter are in the analysis cache.
+    With ``include_outdated`` False, outdated candidates are left out entirely.
+    """
+    if include_outdated:
+        refresh_stale_features(job_id)
+    rows = db.session.query(
+        Candidate.id, Candidate.skills, Candidate.content_hash,
+        Candidate.skill_match_score, Candidate.llm_skipped,
+        Candidate.analysis_outdated(stamp).label('outdated')
+    ).filter(Candidate.job_id == job_id).order_by(Candidate.id).all()
+    if not include_outdated:
+        rows = [row for row in rows if not row.outdated]
+
+    entries = []
+    for row in rows:
+        skills = json.loads(row.skills) if row.skills else []
+        cv_hash = row.content_hash
+        if row.outdated or row.skill_match_score is None:
+            score = calculate_skill_match(skills, job_profile['skills'])
+        else:
+            score = row.skill_match_score
+        entries.append({
+            'id': row.id, 'score': score, 'cv_hash': cv_hash, 'outdated': bool(row.outdated),
+            'has_llm_analysis': not row.outdated and not row.llm_skipped
+        })
+
+    # Stage two: the best skill matches above the threshold, counting those already analyzed
+    shortlist = sorted((e for e in entries if e['score'] >= min_skill_match), key=lambda e: (-e['score'], e['id']))
+    if top_k is not None:
+        shortlist = shortlist[:top_k]
+    llm = [e for e in shortlist if not e['has_llm_analysis']]
+
+    keys = [hashed_cache_key(e['cv_hash'], stamp['job_hash']) for e in llm if e['cv_hash']]
+    cached = 0
+    for start in range(0, len(keys), REANALYSIS_BATCH_SIZE):
+        chunk = keys[start:start + REANALYSIS_BATCH_SIZE]
+        cached_keys = {row.key for row in db.session.query(AnalysisCacheEntry.key).filter(AnalysisCacheEntry.key.in_(chunk))}
+        cached += sum(1 for key in chunk if key in cached_keys)
+
+    return {
+        'candidates': len(entries),
+        'outdated_ids': [e['id'] for e in entries if e['outdated']],
+        'llm_ids': [e['id'] for e in llm],
+        'cached': cached
+    }
+
+
+def run_skill_stage(task: Task, candidate_ids: List[int], job_profile: Dict, stamp: Dict):
+    """Stage one for stored candidates, a batch at a time."""
+    for start in range(0, len(candidate_ids), REANALYSIS_BATCH_SIZE):
+        candidates = Candidate.with_content().filter(
+            Candidate.id.in_(candidate_ids[start:start + REANALYSIS_BATCH_SIZE])
+        ).all()
+        try:
+            for candidate in candidates:
+                # Stored features are only recomputed if the text or skill taxonomy changed
+                candidate.ensure_features()
+                screen_candidate(candidate, candidate.get_skills(), job_profile, stamp)
+            db.session.commit()
+            task.item_done(len(candidates))
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error screening candidates: {str(e)}")
+            task.item_failed(f"Batch of {len(candidates)} candidates: {str(e)}", count=len(candidates))
+
+
+async def _llm_batches(task: Task, candidate_ids: List[int], job_profile: Dict, stamp: Dict) -> int:
+    """Analyze candidates a batch at a time over one Ollama client and concurrency limiter."""
+    client = create_ollama_client()
+    limiter = AdaptiveLimiter()
+    analyzed = 0
+    try:
+        for start in range(0, len(candidate_ids), REANALYSIS_BATCH_SIZE):
+            candidates = {
+                c.id: c for c in
+                Candidate.with_content().filter(Candidate.id.in_(candidate_ids[start:start + REANALYSIS_BATCH_SIZE]))
+            }
+            cvs = []
+            for candidate in candidates.values():
+                candidate.ensure_features()
+                features = candidate.get_features()
+                cvs.append({'candidate_id': candidate.id, 'name': candidate.name,
+                            'cv_text': features['cv_text'] or '', 'skills': features['skills']})
+
+            results = await analyze_cv_batch(cvs, job_profile, client, limiter)
+            failed = []
+            for result in results:
+                if result['analysis'].get('failed'):
+                    # Keep the previous analysis; the candidate is picked again next time
+                    failed.append(result)
+                else:
+                    candidates[result['candidate_id']].set_analysis(result['analysis'], stamp)
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error storing candidate analyses: {str(e)}")
+                task.item_failed(f"Batch of {len(results)} candidates: {str(e)}", count=len(results))
+                continue
+            analyzed += len(results) - len(failed)
+            task.item_done(len(results) - len(failed))
+            for result in failed:
+                task.item_failed(f"Candidate {result['candidate_id']}: LLM analysis failed")
+    finally:
+        limiter.finish()
+        await client.aclose()
+    return analyzed
+
+
+def run_llm_stage(task: Task, candidate_ids: List[int], job_profile: Dict, stamp: Dict) -> int:
+    """Stage two: analyze candidates concurrently with the LLM. Returns how many were analyzed."""
+    if not candidate_ids:
+        return 0
+    return asyncio.run(_llm_batches(task, candidate_ids, job_profile, stamp))
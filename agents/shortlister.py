@@ -2,34 +2,98 @@ from database.db import db
 from app.models.candidate import Candidate
 from app.models.shortlisted_candidate import ShortlistedCandidate
 from datetime import datetime, timezone
+from sqlalchemy import and_, case, insert, literal, or_, select
+
+# Candidates below this score are never selected, however few there are
+MIN_SELECTION_SCORE = 0.45
+# Largest page of top candidates returned at once
+MAX_TOP_CANDIDATES = 100
+
+def _not_shortlisted():
+    """Condition matching candidates that have no shortlisted_candidate row for their job yet."""
+    return ~select(ShortlistedCandidate.id).where(and_(
+        ShortlistedCandidate.candidate_id == Candidate.id,
+        ShortlistedCandidate.job_id == Candidate.job_id
+    )).exists()
+
+def _shortlist_where(condition):
+    """Insert a pending shortlist row for every matching candidate not shortlisted yet."""
+    now = datetime.now(timezone.utc)
+    stmt = insert(ShortlistedCandidate).from_select(
+        ['candidate_id', 'job_id', 'shortlisted_at', 'status'],
+        select(Candidate.id, Candidate.job_id, literal(now), literal('pending'))
+        .where(condition, _not_shortlisted())
+    )
+    count = db.session.execute(stmt).rowcount
+    db.session.commit()
+    return count
 
 def shortlist_candidates(job_id, threshold=0.8):
     """Shortlist candidates for a job based on match score."""
-    # Get candidates with match score >= threshold
-    candidates = Candidate.query.filter(
-        Candidate.job_id == job_id,
-        Candidate.match_score >= threshold
-    ).all()
-    
-    count = 0
-    for candidate in candidates:
-        # Check if already shortlisted
-        if not ShortlistedCandidate.query.filter_by(
-            candidate_id=candidate.id,
-            job_id=job_id
-        ).first():
-            # Create new shortlisted candidate
-            shortlisted = ShortlistedCandidate(
-                candidate_id=candidate.id,
-                job_id=job_id,
-                shortlisted_at=datetime.now(timezone.utc)
-            )
-            db.session.add(shortlisted)
-            count += 1
-    
+    return _shortlist_where(and_(Candidate.job_id == job_id, Candidate.match_score >= threshold))
+
+def shortlist_all_jobs(threshold=0.8):
+    """Shortlist candidates for every job based on match score in a single statement."""
+    return _shortlist_where(Candidate.match_score >= threshold)
+
+def _ranked(job_id, min_score):
+    """Candidates of a job at or above ``min_score``, best first (ties broken by id)."""
+    return (
+        select(Candidate)
+        .where(Candidate.job_id == job_id, Candidate.match_score >= min_score)
+        .order_by(Candidate.match_score.desc(), Candidate.id)
+    )
+
+def top_candidates(job_id, k=5, min_score=MIN_SELECTION_SCORE, after=None):
+    """Get the ``k`` best candidates of a job scoring at least ``min_score``.
+
+    The threshold and limit run in the database, so only ``k`` rows are loaded. For the
+    next page pass ``after=(match_score, id)`` of the last candidate already returned.
+    """
+    query = _ranked(job_id, min_score)
+    if after is not None:
+        after_score, after_id = after
+        query = query.where(or_(
+            Candidate.match_score < after_score,
+            and_(Candidate.match_score == after_score, Candidate.id > after_id)
+        ))
+    return db.session.execute(query.limit(k)).scalars().all()
+
+def select_top_candidates(job_id, count=5, min_score=MIN_SELECTION_SCORE):
+    """Mark the top ``count`` candidates of a job as Selected and all others as Rejected.
+
+    Runs a fixed number of statements regardless of how many candidates the job has:
+    the ranking is a subquery, existing shortlist rows are updated in bulk and rows
+    for the remaining candidates are inserted from a select.
+    Returns ``(selected, total)`` candidate counts.
+    """
+    # Selecting from a derived table lets the LIMIT be used inside IN (...) on every backend
+    ranked = _ranked(job_id, min_score).with_only_columns(Candidate.id).limit(count).subquery()
+    selected_ids = select(ranked.c.id)
+
+    total = db.session.query(db.func.count(Candidate.id)).filter(Candidate.job_id == job_id).scalar()
+    selected = db.session.execute(select(db.func.count()).select_from(ranked)).scalar()
+
+    ShortlistedCandidate.query.filter(
+        ShortlistedCandidate.job_id == job_id,
+        ShortlistedCandidate.candidate_id.in_(selected_ids)
+    ).update({'status': 'Selected'}, synchronize_session=False)
+    ShortlistedCandidate.query.filter(
+        ShortlistedCandidate.job_id == job_id,
+        ShortlistedCandidate.candidate_id.notin_(selected_ids)
+    ).update({'status': 'Rejected'}, synchronize_session=False)
+
+    now = datetime.now(timezone.utc)
+    status = case((Candidate.id.in_(selected_ids), literal('Selected')), else_=literal('Rejected'))
+    db.session.execute(insert(ShortlistedCandidate).from_select(
+        ['candidate_id', 'job_id', 'shortlisted_at', 'status'],
+        select(Candidate.id, Candidate.job_id, literal(now), status)
+        .where(Candidate.job_id == job_id, _not_shortlisted())
+    ))
+
     db.session.commit()
-    return count
+    return selected, total
 
 def get_shortlisted_candidates(job_id):
     """Get all shortlisted candidates for a job."""
-    return ShortlistedCandidate.query.filter_by(job_id=job_id).all() 
\ No newline at end of file
+    return ShortlistedCandidate.query.filter_by(job_id=job_id).all() 
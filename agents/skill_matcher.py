@@ -0,0 +1,87 @@
+"""Single-pass skill matcher compiled from the skill taxonomy in config.py."""
+from typing import Dict, Iterable, List
+import re
+from config import TECHNICAL_SKILLS, SOFT_SKILLS, SKILL_ALIASES
+
+# A term must not be glued to letters, digits or the symbols used inside skill
+# names, so "Java" does not match "JavaScript" and "AI" does not match "maintain".
+_BOUNDARY_BEFORE = r'(?<![A-Za-z0-9_+#])'
+_BOUNDARY_AFTER = r'(?![A-Za-z0-9_+#])'
+
+
+def _is_acronym(term: str) -> bool:
+    """Short all-caps terms (AI, REST, SQL) are matched case-sensitively to avoid common words."""
+    return term.isupper() and len(term.replace(' ', '')) <= 5
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex matching any of ``terms`` with shared prefixes factored out.
+
+    Factoring the alternation into a trie keeps matching cost close to the length of
+    the text rather than the number of terms, so large taxonomies stay fast. Spaces in
+    a term match any run of whitespace.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = []
+        for char in sorted(c for c in node if c):
+            token = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(token + build(node[char]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Find canonical skills and their aliases in text with one compiled regex."""
+
+    def __init__(self, skills: Iterable[str], aliases: Dict[str, List[str]] = None):
+        self._exact: Dict[str, str] = {}
+        self._folded: Dict[str, str] = {}
+
+        for skill in skills:
+            self._add_term(skill, skill)
+        for skill, skill_aliases in (aliases or {}).items():
+            for alias in skill_aliases:
+                self._add_term(alias, skill)
+
+        alternatives = []
+        if self._folded:
+            alternatives.append('(?i:' + _trie_pattern(self._folded) + ')')
+        if self._exact:
+            alternatives.append(_trie_pattern(self._exact))
+        pattern = '|'.join(alternatives) or r'(?!x)x'
+        self._regex = re.compile(_BOUNDARY_BEFORE + '(?:' + pattern + ')' + _BOUNDARY_AFTER)
+
+    def _add_term(self, term: str, skill: str):
+        term = ' '.join(term.split())
+        if _is_acronym(term):
+            self._exact[term] = skill
+        else:
+            self._folded[term.lower()] = skill
+
+    def _canonical(self, matched: str) -> str:
+        matched = ' '.join(matched.split())
+        return self._exact.get(matched) or self._folded.get(matched.lower())
+
+    def find(self, text: str) -> List[str]:
+        """Return the canonical skills found in ``text``, in order of first appearance."""
+        found = {}
+        for match in self._regex.finditer(text or ''):
+            skill = self._canonical(match.group(0))
+            if skill:
+                found.setdefault(skill, None)
+        return list(found)
+
+
+# Built once at import time and shared by every caller
+SKILL_MATCHER = SkillMatcher(TECHNICAL_SKILLS + SOFT_SKILLS, SKILL_ALIASES)
@@ -0,0 +1,72 @@
+"""Vectorized skill scoring of every candidate against every job."""
+from typing import Dict, List, Sequence
+import numpy as np
+from config import TECHNICAL_SKILLS, SOFT_SKILLS, SKILL_WEIGHTS
+
+# Column order of the skill vectors
+SKILL_VOCABULARY = TECHNICAL_SKILLS + SOFT_SKILLS
+SKILL_INDEX = {skill.lower(): i for i, skill in enumerate(SKILL_VOCABULARY)}
+
+
+def encode_skills(skill_lists: Sequence[Sequence[str]]) -> np.ndarray:
+    """Encode skill lists as bit-packed rows over ``SKILL_VOCABULARY`` (one bit per skill)."""
+    dense = np.zeros((len(skill_lists), len(SKILL_VOCABULARY)), dtype=bool)
+    for row, skills in enumerate(skill_lists):
+        columns = [SKILL_INDEX[s.lower()] for s in skills if s.lower() in SKILL_INDEX]
+        dense[row, columns] = True
+    return np.packbits(dense, axis=1)
+
+
+def decode_skills(packed: np.ndarray) -> np.ndarray:
+    """Unpack bit-packed skill rows back into a boolean matrix."""
+    return np.unpackbits(packed, axis=1, count=len(SKILL_VOCABULARY)).astype(bool)
+
+
+def skill_weight_vector(weights: Dict[str, float] = None) -> np.ndarray:
+    """Build the per-skill weight vector; skills without a weight count 1.0."""
+    weights = SKILL_WEIGHTS if weights is None else weights
+    vector = np.ones(len(SKILL_VOCABULARY), dtype=np.float32)
+    for skill, weight in weights.items():
+        if skill.lower() in SKILL_INDEX:
+            vector[SKILL_INDEX[skill.lower()]] = weight
+    return vector
+
+
+def skill_match_matrix(candidate_vectors: np.ndarray, job_vectors: np.ndarray,
+                       weights: Dict[str, float] = None) -> np.ndarray:
+    """Compute the candidates x jobs skill match matrix in one operation.
+
+    Each cell is the weighted share of the job's skills that the candidate has, which
+    equals ``calculate_skill_match`` when all weights are 1. Jobs without any known
+    skill score 0.5, as in ``calculate_skill_match``.
+    """
+    candidates = decode_skills(candidate_vectors).astype(np.float32)
+    weighted_jobs = decode_skills(job_vectors).astype(np.float32) * skill_weight_vector(weights)
+
+    matched = candidates @ weighted_jobs.T
+    required = weighted_jobs.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(required > 0, matched / required, 0.5)
+    return scores.astype(np.float32)
+
+
+def rank_candidates(candidate_ids: List[int], candidate_skills: List[List[str]],
+                    job_ids: List[int], job_skills: List[List[str]],
+                    top_n: int = 10, weights: Dict[str, float] = None) -> Dict[int, List[Dict]]:
+    """Rank every candidate for every job by skill match and keep the ``top_n`` per job."""
+    if not candidate_ids or not job_ids:
+        return {job_id: [] for job_id in job_ids}
+
+    scores = skill_match_matrix(encode_skills(candidate_skills), encode_skills(job_skills), weights)
+    top_n = min(top_n, len(candidate_ids))
+    # argpartition picks the top rows per column without sorting the whole matrix
+    top_rows = np.argpartition(-scores, top_n - 1, axis=0)[:top_n]
+
+    rankings = {}
+    for column, job_id in enumerate(job_ids):
+        rows = sorted(top_rows[:, column], key=lambda r: -scores[r, column])
+        rankings[job_id] = [
+            {'candidate_id': candidate_ids[r], 'skill_score': round(float(scores[r, column]), 3)}
+            for r in rows
+        ]
+    return rankings
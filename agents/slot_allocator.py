@@ -0,0 +1,149 @@
+"""Conflict-aware interview slot allocation across interview panels and business hours."""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+import heapq
+from config import INTERVIEW_PANELS, BUSINESS_HOURS, BUSINESS_DAYS, SCHEDULING_HORIZON_DAYS
+
+
+class SlotConflictError(ValueError):
+    """Raised when an interview slot cannot be booked."""
+
+
+def parse_interview_time(value: str) -> datetime:
+    """Parse an ISO interview time, which must be naive like the stored bookings and business hours.
+
+    Raises ValueError for malformed values and for values with a UTC offset, as their
+    local time in the business hours' zone is not known.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        raise ValueError('Interview times must be local times without a UTC offset')
+    return parsed
+
+
+class PanelCalendar:
+    """Busy intervals of one interview panel, kept sorted and disjoint for O(log n) lookups."""
+
+    def __init__(self):
+        # Parallel lists; as intervals never overlap, ends are sorted as well
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def conflict(self, start: datetime, end: datetime) -> Optional[datetime]:
+        """Get the end of the first busy interval overlapping ``[start, end)``, or None if the panel is free."""
+        i = bisect_right(self.ends, start)  # First interval ending after ``start``
+        if i < len(self.starts) and self.starts[i] < end:
+            return self.ends[i]
+        return None
+
+    def add(self, start: datetime, end: datetime):
+        """Mark ``[start, end)`` busy, merging it with any busy intervals it overlaps."""
+        lo = bisect_right(self.ends, start)
+        hi = bisect_left(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+
+class SlotAllocator:
+    """Place interviews on the earliest free slots of several panels within business hours.
+
+    Datetimes are naive and taken to be in the local time of the business hours.
+    """
+
+    def __init__(self, panels: int = INTERVIEW_PANELS, business_hours: Tuple[int, int] = BUSINESS_HOURS,
+                 business_days: Sequence[int] = BUSINESS_DAYS, horizon_days: int = SCHEDULING_HORIZON_DAYS):
+        if panels < 1:
+            raise ValueError('At least one interview panel is required')
+        self.calendars = [PanelCalendar() for _ in range(panels)]
+        self.open_hour, self.close_hour = business_hours
+        self.business_days = set(business_days)
+        self.horizon = timedelta(days=horizon_days)
+
+    def block(self, start: datetime, duration: int, panel: Optional[int] = None):
+        """Record an existing booking of ``duration`` minutes.
+
+        Bookings without a valid panel go on the first panel free at that time, or on the
+        first panel if every panel is busy, so overbooked legacy data still blocks time.
+        """
+        end = start + timedelta(minutes=duration)
+        if panel is None or not 0 <= panel < len(self.calendars):
+            panel = next((p for p, calendar in enumerate(self.calendars) if calendar.conflict(start, end) is None), 0)
+        self.calendars[panel].add(start, end)
+
+    def within_business_hours(self, start: datetime, duration: int) -> bool:
+        """Check that an interview starting at ``start`` begins and ends on the same business day's hours."""
+        end = start + timedelta(minutes=duration)
+        day_open = start.replace(hour=self.open_hour, minute=0, second=0, microsecond=0)
+        day_close = start.replace(hour=self.close_hour, minute=0, second=0, microsecond=0)
+        return start.weekday() in self.business_days and day_open <= start and end <= day_close
+
+    def _next_business_start(self, start: datetime, duration: int) -> datetime:
+        """Move ``start`` forward to the earliest time an interview of ``duration`` minutes fits in business hours."""
+        if timedelta(minutes=duration) > timedelta(hours=self.close_hour - self.open_hour) or not self.business_days:
+            raise SlotConflictError(f'A {duration} minute interview does not fit in business hours')
+        while not self.within_business_hours(start, duration):
+            day_open = start.replace(hour=self.open_hour, minute=0, second=0, microsecond=0)
+            start = day_open if start < day_open and start.weekday() in self.business_days else day_open + timedelta(days=1)
+        return start
+
+    def earliest_slot(self, panel: int, start: datetime, duration: int) -> datetime:
+        """Get the earliest start at or after ``start`` where ``panel`` is free for ``duration`` minutes."""
+        limit = start + self.horizon
+        length = timedelta(minutes=duration)
+        calendar = self.calendars[panel]
+        while True:
+            start = self._next_business_start(start, duration)
+            if start > limit:
+                raise SlotConflictError(f'No free interview slot within {self.horizon.days} days')
+            busy_until = calendar.conflict(start, start + length)
+            if busy_until is None:
+                return start
+            start = busy_until
+
+    def allocate(self, count: int, start: datetime, duration: int, break_duration: int = 0) -> List[Tuple[datetime, int]]:
+        """Book ``count`` interviews of ``duration`` minutes from ``start`` on, earliest first.
+
+        A min-heap holds the next free slot of every panel, so each interview costs
+        O(log panels) plus O(log bookings) per busy interval it has to skip. Consecutive
+        interviews on a panel are ``break_duration`` minutes apart. Returns
+        ``(start, panel)`` pairs in booking order.
+        """
+        length = timedelta(minutes=duration)
+        gap = timedelta(minutes=break_duration)
+        heap = [(self.earliest_slot(panel, start, duration), panel) for panel in range(len(self.calendars))]
+        heapq.heapify(heap)
+
+        slots = []
+        for _ in range(count):
+            slot, panel = heapq.heappop(heap)
+            self.calendars[panel].add(slot, slot + length)
+            slots.append((slot, panel))
+            heapq.heappush(heap, (self.earliest_slot(panel, slot + length + gap, duration), panel))
+        return slots
+
+    def reserve(self, start: datetime, duration: int, panel: Optional[int] = None) -> int:
+        """Book an interview at exactly ``start``, on ``panel`` if it is free or else on any free panel.
+
+        Returns the panel booked, or raises SlotConflictError if the time is outside
+        business hours or every panel is busy.
+        """
+        if not self.within_business_hours(start, duration):
+            raise SlotConflictError(
+                f'Interviews must be held on business days between {self.open_hour}:00 and {self.close_hour}:00'
+            )
+        end = start + timedelta(minutes=duration)
+        candidates = range(len(self.calendars))
+        if panel is not None and 0 <= panel < len(self.calendars):
+            candidates = [panel] + [p for p in candidates if p != panel]
+        for candidate in candidates:
+            if self.calendars[candidate].conflict(start, end) is None:
+                self.calendars[candidate].add(start, end)
+                return candidate
+        raise SlotConflictError('The requested time overlaps other interviews on every panel')
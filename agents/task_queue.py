@@ -0,0 +1,125 @@
+"""In-process background task queue for long-running ingestion work."""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import logging
+import threading
+import time
+import uuid
+from config import TASK_WORKERS, TASK_HISTORY_LIMIT
+
+logger = logging.getLogger(__name__)
+
+
+class Task:
+    """Progress record for a unit of background work made of ``total`` items."""
+
+    def __init__(self, name: str, total: int):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.status = 'queued'  # queued, running, completed, failed
+        self.message = ''
+        self.errors: List[str] = []
+        self.result: Dict = {}
+        self.created_at = datetime.now(timezone.utc)
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+
+    def item_done(self, count: int = 1):
+        """Record successfully processed items."""
+        with self._lock:
+            self.done += count
+
+    def item_failed(self, error: str, count: int = 1):
+        """Record items that could not be processed."""
+        with self._lock:
+            self.failed += count
+            self.errors.append(error)
+
+    def add_items(self, count: int):
+        """Grow the task when more work is discovered while it runs."""
+        with self._lock:
+            self.total += count
+
+    def to_dict(self) -> Dict:
+        """Convert the task progress to dictionary format."""
+        with self._lock:
+            processed = self.done + self.failed
+            if self._started:
+                elapsed = (self._finished or time.monotonic()) - self._started
+            else:
+                elapsed = 0.0
+            return {
+                'task_id': self.id,
+                'name': self.name,
+                'status': self.status,
+                'total': self.total,
+                'done': self.done,
+                'failed': self.failed,
+                'queued': max(self.total - processed, 0),
+                'elapsed_seconds': round(elapsed, 2),
+                'items_per_second': round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+                'message': self.message,
+                'errors': self.errors[-20:],
+                'result': self.result,
+                'created_at': self.created_at.isoformat()
+            }
+
+
+_executor = ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix='hireminds-task')
+_tasks: Dict[str, Task] = {}
+_tasks_lock = threading.Lock()
+
+
+def _forget_old_tasks():
+    """Drop the oldest finished tasks once the history limit is exceeded."""
+    finished = [t for t in _tasks.values() if t.status in ('completed', 'failed')]
+    overflow = len(_tasks) - TASK_HISTORY_LIMIT
+    for task in sorted(finished, key=lambda t: t.created_at)[:max(overflow, 0)]:
+        del _tasks[task.id]
+
+
+def _run_task(app, task: Task, func: Callable, args: tuple):
+    """Run a task function inside an application context and record its outcome."""
+    task._started = time.monotonic()
+    task.status = 'running'
+    try:
+        with app.app_context():
+            func(task, *args)
+        task.status = 'completed'
+    except Exception as e:
+        logger.error(f"Task {task.name} ({task.id}) failed: {str(e)}")
+        task.status = 'failed'
+        task.message = str(e)
+    finally:
+        task._finished = time.monotonic()
+
+
+def submit_task(app, name: str, total: int, func: Callable, *args) -> Task:
+    """Queue ``func(task, *args)`` on the worker pool and return its task record.
+
+    ``app`` must be the real Flask application object (``current_app._get_current_object()``)
+    so the worker can open its own application context and database session.
+    """
+    task = Task(name, total)
+    with _tasks_lock:
+        _forget_old_tasks()
+        _tasks[task.id] = task
+    _executor.submit(_run_task, app, task, func, args)
+    return task
+
+
+def get_task(task_id: str) -> Optional[Task]:
+    """Get a task by id, or None if it is unknown or has been forgotten."""
+    with _tasks_lock:
+        return _tasks.get(task_id)
+
+
+def find_active_task(name: str) -> Optional[Task]:
+    """Get a queued or running task with this name, or None, so the same work is not queued twice."""
+    with _tasks_lock:
+        return next((t for t in _tasks.values() if t.name == name and t.status in ('queued', 'running')), None)
@@ -1,12 +1,16 @@
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
+from flask_mail import Mail
 from flask_migrate import Migrate
+from database.db import db
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+migrate = Migrate()
+mail = Mail()
+
 def create_app():
     app = Flask(__name__)
     
@@ -19,9 +23,20 @@ def create_app():
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev')
     
+    # Configure mail (point MAIL_SERVER/MAIL_PORT at a local debugging SMTP server to test)
+    app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'localhost')
+    app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', '25'))
+    app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS', 'false').lower() == 'true'
+    app.config['MAIL_USE_SSL'] = os.getenv('MAIL_USE_SSL', 'false').lower() == 'true'
+    app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
+    app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
+    app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER', 'recruitment@localhost')
+    app.config['COMPANY_NAME'] = os.getenv('COMPANY_NAME', 'HireMinds')
+    
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
+    mail.init_app(app)
     
     # Register blueprints
     from app.routes import main
@@ -0,0 +1,14 @@
+from database.db import db
+from datetime import datetime, timezone
+
+class AnalysisCacheEntry(db.Model):
+    """Model for cached LLM analyses keyed on content hashes."""
+    __tablename__ = 'analysis_cache'
+    
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of CV hash, JD hash, model and template version
+    analysis = db.Column(db.Text, nullable=False)  # Raw LLM analysis as JSON string
+    model = db.Column(db.String(100), nullable=False)
+    template_version = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_used_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,34 @@
+from database.db import db
+
+class AnalysisItem(db.Model):
+    """Model for one strength, weakness or key skill from a candidate's analysis."""
+    __tablename__ = 'analysis_item'
+    __table_args__ = (
+        # Serves "candidates with skill X" lookups without reading the analysis JSON
+        db.Index('ix_analysis_item_kind_normalized', 'kind', 'normalized'),
+    )
+    
+    KINDS = {'strengths': 'strength', 'weaknesses': 'weakness', 'key_skills': 'skill'}
+    
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id', ondelete='CASCADE'), nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)  # strength, weakness, skill
+    value = db.Column(db.String(500), nullable=False)
+    normalized = db.Column(db.String(500), nullable=False)  # Lower-cased value used for matching
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def normalize(value):
+        """Normalize an item value for case-insensitive matching."""
+        return ' '.join(str(value).split()).lower()[:500]
+
+    @classmethod
+    def from_analysis(cls, analysis):
+        """Build the items listed in an analysis dictionary."""
+        items = []
+        for key, kind in cls.KINDS.items():
+            for position, value in enumerate(analysis.get(key) or []):
+                value = ' '.join(str(value).split())
+                if value:
+                    items.append(cls(kind=kind, value=value[:500], normalized=cls.normalize(value), position=position))
+        return items
@@ -1,20 +1,150 @@
 from database.db import db
+from app.models.analysis_item import AnalysisItem
+from app.models.cv_document import CVDocument
+from sqlalchemy.orm import joinedload, undefer_group
 from datetime import datetime, timezone
-import re
+import json
 
 class Candidate(db.Model):
     """Model for job candidates."""
     __tablename__ = 'candidate'
+    __table_args__ = (
+        # Serves per-job listings and score-ordered ranking without a sort
+        db.Index('ix_candidate_job_id_match_score', 'job_id', 'match_score'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
-    cv_text = db.Column(db.Text, nullable=False)
-    analysis = db.Column(db.Text)  # Store the analysis as JSON string
+    # Large text columns are deferred and only loaded on access or through with_content()
+    _cv_text = db.deferred(db.Column('cv_text', db.Text), group='content')  # Only set for candidates created before CV documents existed
+    document_id = db.Column(db.Integer, db.ForeignKey('cv_document.id'), index=True)
+    analysis = db.deferred(db.Column(db.Text), group='content')  # Store the analysis as JSON string
     match_score = db.Column(db.Float, default=0.0)
+    
+    # Score breakdown from the analysis, stored as columns so it can be filtered and sorted on
+    essential_skills_score = db.Column(db.Float, index=True)
+    experience_score = db.Column(db.Float, index=True)
+    education_score = db.Column(db.Float, index=True)
+    additional_score = db.Column(db.Float, index=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
     applied_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     shortlisted = db.Column(db.Boolean, default=False)
     shortlisted_at = db.Column(db.DateTime)
+    
+    # Features derived from cv_text once at ingest (see agents/cv_features.py)
+    content_hash = db.Column(db.String(64), index=True)
+    email = db.Column(db.String(320))
+    detected_name = db.Column(db.String(200))
+    skills = db.Column(db.Text)  # Store the skill list as JSON string
+    features_version = db.Column(db.Integer)  # SKILL_TAXONOMY_VERSION the features were computed with
+    
+    # What the stored analysis was computed with (see agents.cv_analyzer.analysis_stamp), NULL if unknown or failed
+    analysis_job_hash = db.Column(db.String(64))  # Hash of the job description sent to the LLM
+    analysis_model = db.Column(db.String(100))
+    analysis_prompt_version = db.Column(db.Integer)  # CV_ANALYSIS_TEMPLATE_VERSION
+    analysis_taxonomy_version = db.Column(db.Integer)  # SKILL_TAXONOMY_VERSION
+    
+    # Screening (see agents/screening.py): every candidate gets a skill match, only the best an LLM analysis
+    skill_match_score = db.Column(db.Float)
+    llm_skipped = db.Column(db.Boolean, default=False)  # The stored analysis is skill-only
+    
+    # Relationships
+    document = db.relationship('CVDocument', back_populates='candidates')
+    analysis_items = db.relationship('AnalysisItem', backref='candidate', lazy=True,
+                                     cascade='all, delete-orphan', passive_deletes=True,
+                                     order_by='AnalysisItem.position')
+
+    @classmethod
+    def with_content(cls):
+        """Query candidates with their CV text and analysis loaded in the same statement."""
+        return cls.query.options(undefer_group('content'), joinedload(cls.document).undefer_group('content'))
+
+    @property
+    def cv_text(self):
+        """Get the CV text, shared through the candidate's document when it has one."""
+        return self.document.cv_text if self.document else self._cv_text
+
+    @cv_text.setter
+    def cv_text(self, value):
+        """Set a candidate-specific CV text and mark derived features stale."""
+        self._cv_text = value
+        self.document = None
+        self.features_version = None
+
+    @classmethod
+    def analysis_outdated(cls, stamp):
+        """SQL condition matching candidates whose analysis was not computed with ``stamp`` or whose CV changed since."""
+        return db.or_(
+            cls.analysis_job_hash.is_distinct_from(stamp['job_hash']),
+            cls.analysis_model.is_distinct_from(stamp['model']),
+            cls.analysis_prompt_version.is_distinct_from(stamp['prompt_version']),
+            cls.analysis_taxonomy_version.is_distinct_from(stamp['taxonomy_version']),
+            cls.features_version.is_distinct_from(stamp['taxonomy_version'])
+        )
+
+    def set_analysis(self, analysis, stamp=None):
+        """Store an analysis dictionary along with its score breakdown columns and list items.
+
+        ``stamp`` records what the analysis was computed with; failed analyses are left
+        unstamped so the next reanalysis retries them.
+        """
+        if analysis.get('failed'):
+            stamp = None
+        stamp = stamp or {}
+        self.analysis_job_hash = stamp.get('job_hash')
+        self.analysis_model = stamp.get('model')
+        self.analysis_prompt_version = stamp.get('prompt_version')
+        self.analysis_taxonomy_version = stamp.get('taxonomy_version')
+        self.llm_skipped = bool(analysis.get('llm_skipped'))
+        breakdown = analysis.get('score_breakdown') or {}
+        self.analysis = json.dumps(analysis)
+        self.match_score = analysis.get('match_score', 0.0)
+        self.essential_skills_score = breakdown.get('essential_skills')
+        self.experience_score = breakdown.get('experience')
+        self.education_score = breakdown.get('education')
+        self.additional_score = breakdown.get('additional')
+        self.analysis_items = AnalysisItem.from_analysis(analysis)
+
+    def attach_document(self, document, features):
+        """Point the candidate at a shared CV document and copy its derived features."""
+        self._cv_text = None
+        self.document = document
+        self.apply_features(features)
+
+    def apply_features(self, features):
+        """Store the output of compute_cv_features on the candidate."""
+        if self.content_hash != features['content_hash']:
+            # The stored analysis was of another CV text
+            self.analysis_job_hash = None
+        self.content_hash = features['content_hash']
+        self.email = features['email']
+        self.detected_name = features['detected_name']
+        self.skills = json.dumps(features['skills'])
+        self.features_version = features['features_version']
+
+    def get_features(self):
+        """Get the stored derived features in the format of compute_cv_features."""
+        return {
+            'cv_text': self.cv_text,
+            'content_hash': self.content_hash,
+            'email': self.email,
+            'detected_name': self.detected_name,
+            'skills': json.loads(self.skills) if self.skills else [],
+            'features_version': self.features_version
+        }
+
+    def ensure_features(self):
+        """Recompute derived features if the CV text or the skill taxonomy changed since they were stored."""
+        from agents.cv_features import compute_cv_features
+        from config import SKILL_TAXONOMY_VERSION
+        
+        if self.features_version != SKILL_TAXONOMY_VERSION:
+            self.apply_features(compute_cv_features(self.cv_text))
+
+    def get_skills(self):
+        """Get the stored skill list of the candidate."""
+        self.ensure_features()
+        return json.loads(self.skills) if self.skills else []
 
     def to_dict(self):
         """Convert candidate to dictionary format."""
@@ -27,7 +157,12 @@ class Candidate(db.Model):
             'job_id': self.job_id,
             'applied_at': self.applied_at.isoformat() if self.applied_at else None,
             'shortlisted': self.shortlisted,
-            'shortlisted_at': self.shortlisted_at.isoformat() if self.shortlisted_at else None
+            'shortlisted_at': self.shortlisted_at.isoformat() if self.shortlisted_at else None,
+            'email': self.email,
+            'detected_name': self.detected_name,
+            'skills': json.loads(self.skills) if self.skills else [],
+            'skill_match_score': self.skill_match_score,
+            'llm_skipped': self.llm_skipped
         }
 
     def get_shortlist_status(self):
@@ -37,45 +172,18 @@ class Candidate(db.Model):
         return 'Pending'
 
     def extract_email(self):
-        """Extract email from CV text using regex."""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        matches = re.findall(email_pattern, self.cv_text)
-        return matches[0] if matches else None
+        """Get the email address found in the CV text."""
+        self.ensure_features()
+        return self.email
 
     def send_interview_invite(self, meeting_data):
         """Send interview invite email to candidate."""
-        from flask_mail import Message
-        from flask import current_app
+        from agents.mailer import build_invite_message
         from app import mail
         
         email = self.extract_email()
         if not email:
             raise ValueError("No email found in CV")
-
-        subject = f"Interview Invitation - {current_app.config['COMPANY_NAME']}"
-        
-        body = f"""Dear {self.name},
-
-We are pleased to invite you for an interview for the position you applied for.
-
-Interview Details:
-Date & Time: {meeting_data['meetingDate']}
-Duration: {meeting_data['meetingDuration']} minutes
-Meeting Link: {meeting_data['meetingLink']}
-
-{meeting_data.get('additionalNotes', '')}
-
-Please confirm your attendance by clicking the meeting link at the scheduled time.
-
-Best regards,
-{current_app.config['COMPANY_NAME']} Recruitment Team
-"""
-        
-        msg = Message(
-            subject=subject,
-            recipients=[email],
-            body=body
-        )
         
-        mail.send(msg)
+        mail.send(build_invite_message(self.name, email, meeting_data))
         return True 
\ No newline at end of file
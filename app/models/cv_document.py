@@ -0,0 +1,15 @@
+from database.db import db
+from datetime import datetime, timezone
+
+class CVDocument(db.Model):
+    """Model for a distinct CV, stored once and shared by every application that uses it."""
+    __tablename__ = 'cv_document'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)  # sha256 of the cleaned text
+    file_hash = db.Column(db.String(64), index=True)  # sha256 of the uploaded file bytes
+    cv_text = db.deferred(db.Column(db.Text, nullable=False), group='content')
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    
+    # Relationships
+    candidates = db.relationship('Candidate', back_populates='document', lazy=True)
@@ -1,14 +1,28 @@
 from database.db import db
+from sqlalchemy.orm import validates
 from datetime import datetime, timezone
+from app.models.job_profile import JobProfile
+
+# Stray quote escaping left in imported job text, removed in this order
+JOB_TEXT_REPLACEMENTS = (("'''", ""), ("''", "'"))
+
+def clean_job_text(value):
+    """Strip the stray quote escaping left in imported job text."""
+    if not value:
+        return ""
+    for old, new in JOB_TEXT_REPLACEMENTS:
+        value = value.replace(old, new)
+    return value
 
 class Job(db.Model):
     """Model for job listings."""
     __tablename__ = 'job'
     
     id = db.Column(db.Integer, primary_key=True)
-    _title = db.Column('title', db.String(200), nullable=False)
-    _description = db.Column('description', db.Text, nullable=False)
-    _requirements = db.Column('requirements', db.Text, nullable=False)
+    # Stored already cleaned (see normalize_text); bulk writers must call clean_job_text themselves
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     
     # Relationships
@@ -17,41 +31,20 @@ class Job(db.Model):
                                           backref=db.backref('job_listing', lazy=True),
                                           lazy=True, 
                                           cascade='all, delete-orphan')
+    profile = db.relationship('JobProfile', backref=db.backref('job', lazy=True), uselist=False,
+                              cascade='all, delete-orphan')
 
-    @property
-    def title(self):
-        """Get cleaned title text."""
-        return self._title.replace("'''", "").replace("''", "'").replace("'", "'") if self._title else ""
-
-    @title.setter
-    def title(self, value):
-        """Set title with cleaning."""
-        self._title = value.replace("'''", "").replace("''", "'").replace("'", "'") if value else ""
-
-    @property
-    def description(self):
-        """Get cleaned description text."""
-        return self._description.replace("'''", "").replace("''", "'").replace("'", "'") if self._description else ""
-
-    @description.setter
-    def description(self, value):
-        """Set description with cleaning."""
-        self._description = value.replace("'''", "").replace("''", "'").replace("'", "'") if value else ""
-
-    @property
-    def requirements(self):
-        """Get cleaned requirements text."""
-        return self._requirements.replace("'''", "").replace("''", "'").replace("'", "'") if self._requirements else ""
-
-    @requirements.setter
-    def requirements(self, value):
-        """Set requirements with cleaning."""
-        self._requirements = value.replace("'''", "").replace("''", "'").replace("'", "'") if value else ""
+    @validates('title', 'description', 'requirements')
+    def normalize_text(self, key, value):
+        """Clean job text once on write so reads are plain attribute access."""
+        return clean_job_text(value)
 
     def get_candidate_count(self):
         """Get the total number of candidates for this job."""
-        return len(self.candidates)
+        from app.models.candidate import Candidate
+        return db.session.query(db.func.count(Candidate.id)).filter(Candidate.job_id == self.id).scalar()
 
     def get_shortlisted_count(self):
         """Get the number of shortlisted candidates for this job."""
-        return len(self.shortlisted_candidates) 
\ No newline at end of file
+        from app.models.shortlisted_candidate import ShortlistedCandidate
+        return db.session.query(db.func.count(ShortlistedCandidate.id)).filter(ShortlistedCandidate.job_id == self.id).scalar() 
\ No newline at end of file
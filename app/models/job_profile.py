@@ -0,0 +1,37 @@
+from database.db import db
+from datetime import datetime, timezone
+import json
+
+class JobProfile(db.Model):
+    """Model for the analysis-ready form of a job, computed once per version of its description."""
+    __tablename__ = 'job_profile'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), nullable=False, unique=True)
+    description_hash = db.Column(db.String(64), nullable=False)  # content_hash of the job description it was built from
+    description = db.Column(db.Text, nullable=False)  # Cleaned and truncated to MAX_TEXT_LENGTH
+    skills = db.Column(db.Text, nullable=False)  # Required skills as JSON list
+    taxonomy_version = db.Column(db.Integer, nullable=False)  # SKILL_TAXONOMY_VERSION the skills were extracted with
+    summary = db.Column(db.Text)  # LLM summary as JSON string, filled in the background
+    summary_status = db.Column(db.String(20), nullable=False, default='pending')  # pending, ready, failed
+    updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def get_skills(self):
+        """Get the required skills of the job."""
+        return json.loads(self.skills) if self.skills else []
+
+    def get_summary(self):
+        """Get the stored summary, or None until it has been generated."""
+        if self.summary_status != 'ready' or not self.summary:
+            return None
+        return json.loads(self.summary)
+
+    def to_dict(self):
+        """Convert job profile to dictionary format."""
+        return {
+            'job_id': self.job_id,
+            'skills': self.get_skills(),
+            'summary': self.get_summary(),
+            'summary_status': self.summary_status,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -4,14 +4,20 @@ from datetime import datetime, timezone
 class ShortlistedCandidate(db.Model):
     """Model for shortlisted candidates."""
     __tablename__ = 'shortlisted_candidate'
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'candidate_id', name='uq_shortlisted_candidate_job_id_candidate_id'),
+        db.Index('ix_shortlisted_candidate_status_interview_date', 'status', 'interview_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id'), nullable=False)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id'), nullable=False, index=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
     shortlisted_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     interview_date = db.Column(db.DateTime, nullable=True)
     status = db.Column(db.String(50), nullable=False, default='pending')  # pending, scheduled, completed, cancelled
     meeting_link = db.Column(db.String(500), nullable=True)
+    interview_duration = db.Column(db.Integer, nullable=True)  # Minutes; INTERVIEW_DEFAULT_DURATION when not set
+    panel = db.Column(db.Integer, nullable=True)  # Interview panel the slot is booked on, 0 to INTERVIEW_PANELS - 1
     
     # Relationships
     candidate = db.relationship('Candidate', backref=db.backref('shortlisted_candidate', uselist=False))
@@ -3,20 +3,30 @@ from database.db import db
 from app.models.job import Job
 from app.models.candidate import Candidate
 from app.models.shortlisted_candidate import ShortlistedCandidate
+from app.models.analysis_item import AnalysisItem
+from app.models.job_profile import JobProfile
 from agents.jd_summarizer import store_jd
-from agents.cv_analyzer import analyze_cv, store_candidate
-from agents.shortlister import shortlist_candidates, get_shortlisted_candidates
-from agents.scheduler import schedule_interviews, get_scheduled_interviews
-import pandas as pd
+from agents.cv_importer import import_cvs_for_job, import_cvs_for_all_jobs, reanalyze_job_candidates, plan_reanalysis
+from agents.job_importer import import_job_catalog, JobImportError
+from agents.job_profiles import build_job_profiles, get_job_profiles, get_stored_job_skills, ensure_job_profile
+from agents.screening import refresh_features
+from agents.mailer import send_interview_invites
+from agents.task_queue import submit_task, get_task, find_active_task
+from agents.analysis_cache import get_cache_stats
+from agents.concurrency import get_llm_metrics
+from agents.skill_matrix import rank_candidates
+from agents.shortlister import shortlist_all_jobs, select_top_candidates, top_candidates, get_shortlisted_candidates, MIN_SELECTION_SCORE, MAX_TOP_CANDIDATES
+from agents.scheduler import schedule_interviews as schedule_job_interviews, schedule_candidates, get_scheduled_interviews, load_allocator
+from agents.slot_allocator import SlotConflictError, parse_interview_time
+from config import INTERVIEW_DEFAULT_DURATION, SKILL_TAXONOMY_VERSION
+from agents.listings import get_dashboard_stats, list_jobs, list_candidates, search_candidates, list_upcoming_interviews, serialize_page, SCORE_COLUMNS
 import os
 from datetime import datetime, timezone, timedelta
 from werkzeug.utils import secure_filename
-import PyPDF2
-import io
-from PyPDF2 import PdfReader
 from agents.summarizer import summarize_job
 import json
 import random
+import time
 
 main = Blueprint('main', __name__)
 
@@ -35,17 +45,16 @@ if not os.path.exists(UPLOAD_FOLDER):
 def allowed_file(filename, file_type):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS[file_type]
 
-def read_pdf(file):
-    """Extract text from PDF file."""
-    try:
-        pdf_reader = PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        print(f"Error reading PDF: {str(e)}")
-        return None
+def task_accepted(task, message):
+    """Build the 202 response returned when work has been queued in the background."""
+    response = jsonify({
+        'success': True,
+        'task_id': task.id,
+        'status_url': url_for('main.get_task_progress', task_id=task.id),
+        'message': message
+    })
+    response.status_code = 202
+    return response
 
 def get_dataset_path():
     """Get the path to the dataset directory."""
@@ -55,10 +64,60 @@ def get_dataset_path():
 @main.route('/')
 def index():
     """Render the dashboard with jobs, candidates, and shortlisted candidates."""
-    jobs = Job.query.all()
-    candidates = Candidate.query.all()
-    shortlisted = ShortlistedCandidate.query.all()
-    return render_template('dashboard.html', jobs=jobs, candidates=candidates, shortlisted=shortlisted)
+    return render_template(
+        'dashboard.html',
+        stats=get_dashboard_stats(),
+        jobs=list_jobs(per_page=5)['items'],
+        candidates=list_candidates(per_page=5)['items'],
+        interviews=list_upcoming_interviews(per_page=5)['items']
+    )
+
+@main.route('/api/dashboard-stats')
+def dashboard_stats():
+    """Get the dashboard totals."""
+    return jsonify({'success': True, **get_dashboard_stats()})
+
+@main.route('/api/jobs')
+def list_jobs_route():
+    """Get a page of jobs with their candidate and shortlist counts."""
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    return jsonify({'success': True, **serialize_page(list_jobs(page, per_page))})
+
+@main.route('/api/candidates')
+def list_candidates_route():
+    """Get a page of candidates, optionally for one job."""
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    job_id = request.args.get('job_id', type=int)
+    return jsonify({'success': True, **serialize_page(list_candidates(page, per_page, job_id))})
+
+@main.route('/api/candidates/search')
+def search_candidates_route():
+    """Find candidates by minimum analysis scores (min_<score>=) and key skills (skill=, repeatable)."""
+    try:
+        min_scores = {
+            name: float(request.args[f'min_{name}'])
+            for name in SCORE_COLUMNS if f'min_{name}' in request.args
+        }
+        result = search_candidates(
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 20, type=int),
+            job_id=request.args.get('job_id', type=int),
+            min_scores=min_scores,
+            skills=request.args.getlist('skill'),
+            sort=request.args.get('sort', 'match')
+        )
+        return jsonify({'success': True, **serialize_page(result)})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@main.route('/api/interviews/upcoming')
+def list_upcoming_interviews_route():
+    """Get a page of scheduled interviews in date order."""
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    return jsonify({'success': True, **serialize_page(list_upcoming_interviews(page, per_page))})
 
 @main.route('/jobs')
 def jobs():
@@ -88,76 +147,31 @@ def import_jobs():
         return jsonify({'success': False, 'error': 'Invalid file type. Please upload an Excel or CSV file.'}), 400
     
     try:
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
-        
-        if filename.endswith('.csv'):
-            # Try different encodings
-            encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
-            df = None
-            
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(filepath, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if df is None:
-                return jsonify({
-                    'success': False,
-                    'error': 'Could not read the CSV file. Please ensure it is properly encoded.'
-                }), 400
-        else:
-            df = pd.read_excel(filepath)
-        
-        # Check for required columns
-        required_columns = ['Job Title', 'Job Description']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            return jsonify({
-                'success': False,
-                'error': f'Missing required columns: {", ".join(missing_columns)}'
-            }), 400
-        
-        jobs_created = 0
-        for _, row in df.iterrows():
-            if pd.isna(row['Job Description']):
-                continue
-                
-            # Clean the text by removing special characters and triple quotes
-            title = str(row['Job Title']).strip() if not pd.isna(row['Job Title']) else 'Untitled Job'
-            description = str(row['Job Description']).strip()
-            
-            # Extract requirements from description if not provided
-            requirements = str(row.get('Requirements', description)).strip()
-            
-            # Remove triple quotes and clean text
-            title = title.replace("'''", "").replace("''", "'").replace("'", "'")
-            description = description.replace("'''", "").replace("''", "'").replace("'", "'")
-            requirements = requirements.replace("'''", "").replace("''", "'").replace("'", "'")
-            
-            job = Job(
-                title=title,
-                description=description,
-                requirements=requirements,
-                created_at=datetime.now(timezone.utc)
-            )
-            db.session.add(job)
-            jobs_created += 1
-        
-        db.session.commit()
-        os.remove(filepath)
+        # The upload is parsed straight from the request stream, chunk by chunk
+        progress = import_job_catalog(file.stream, secure_filename(file.filename))
+        # Profiles and summaries of the new jobs are built in the background
+        task = submit_task(current_app._get_current_object(), 'build-job-profiles', 0, build_job_profiles)
         return jsonify({
             'success': True,
-            'message': f'Successfully imported {jobs_created} jobs'
+            'message': f'Successfully imported {progress["jobs_created"]} jobs',
+            'profile_task_id': task.id,
+            'profile_status_url': url_for('main.get_task_progress', task_id=task.id),
+            **progress
         })
+    except JobImportError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
-        db.session.rollback()
         print(f"Error importing jobs: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@main.route('/api/job-profile/<int:job_id>')
+def get_job_profile(job_id):
+    """Get the stored skills and summary of a job."""
+    job = Job.query.get_or_404(job_id)
+    profile = ensure_job_profile(job)
+    db.session.commit()
+    return jsonify({'success': True, 'profile': profile.to_dict()})
+
 @main.route('/api/import-cvs', methods=['POST'])
 def import_cvs():
     if 'files' not in request.files:
@@ -187,46 +201,13 @@ def import_cvs():
             'message': 'Job not found'
         })
     
-    processed_count = 0
-    for file in files:
-        if file and file.filename.endswith('.pdf'):
-            try:
-                # Read PDF file
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                
-                # Analyze CV
-                analysis = analyze_cv(text, job.description)
-                
-                # Create candidate
-                candidate = Candidate(
-                    name=file.filename.replace('.pdf', ''),
-                    cv_text=text,
-                    analysis=json.dumps(analysis),
-                    match_score=analysis.get('match_score', 0.0),
-                    job_id=job_id
-                )
-                db.session.add(candidate)
-                processed_count += 1
-                
-            except Exception as e:
-                print(f"Error processing file {file.filename}: {str(e)}")
-                continue
+    # Read the uploads now; the request streams are closed once we return
+    uploads = [(file.filename, file.read()) for file in files
+               if file and file.filename.endswith('.pdf')]
     
-    try:
-        db.session.commit()
-        return jsonify({
-            'success': True,
-            'message': f'Successfully processed {processed_count} CVs'
-        })
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'message': f'Error saving candidates: {str(e)}'
-        })
+    task = submit_task(current_app._get_current_object(), 'import-cvs', len(uploads),
+                       import_cvs_for_job, job.id, uploads)
+    return task_accepted(task, f'Queued {len(uploads)} CVs for processing')
 
 @main.route('/api/import-all-cvs', methods=['POST'])
 def import_all_cvs():
@@ -243,50 +224,13 @@ def import_all_cvs():
             'message': 'No files selected'
         })
     
-    processed_count = 0
-    for file in files:
-        if file and file.filename.endswith('.pdf'):
-            try:
-                # Read PDF file
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                
-                # Get all jobs
-                jobs = Job.query.all()
-                
-                for job in jobs:
-                    # Analyze CV against each job
-                    analysis = analyze_cv(text, job.description)
-                    
-                    # Create candidate
-                    candidate = Candidate(
-                        name=file.filename.replace('.pdf', ''),
-                        cv_text=text,
-                        analysis=json.dumps(analysis),
-                        match_score=analysis.get('match_score', 0.0),
-                        job_id=job.id
-                    )
-                    db.session.add(candidate)
-                    processed_count += 1
-                
-            except Exception as e:
-                print(f"Error processing file {file.filename}: {str(e)}")
-                continue
+    # Read the uploads now; the request streams are closed once we return
+    uploads = [(file.filename, file.read()) for file in files
+               if file and file.filename.endswith('.pdf')]
     
-    try:
-        db.session.commit()
-        return jsonify({
-            'success': True,
-            'message': f'Successfully processed {processed_count} CVs'
-        })
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'message': f'Error saving candidates: {str(e)}'
-        })
+    task = submit_task(current_app._get_current_object(), 'import-all-cvs', len(uploads),
+                       import_cvs_for_all_jobs, uploads)
+    return task_accepted(task, f'Queued {len(uploads)} CVs for processing against all jobs')
 
 @main.route('/api/shortlist-candidates/<int:job_id>', methods=['POST'])
 def shortlist_candidates_route(job_id):
@@ -295,39 +239,13 @@ def shortlist_candidates_route(job_id):
         data = request.get_json()
         count = data.get('count', 5)  # Default to top 5 if not specified
         
-        # Get all candidates for the job, sorted by match score
-        candidates = Candidate.query.filter_by(job_id=job_id).order_by(Candidate.match_score.desc()).all()
-        
-        # Update status for all candidates
-        for i, candidate in enumerate(candidates):
-            analysis = json.loads(candidate.analysis)
-            if i < count and candidate.match_score >= 0.45:  # Only shortlist if score is at least 0.45
-                status = 'Selected'
-            else:
-                status = 'Rejected'
-            
-            # Create or update shortlisted candidate
-            shortlisted = ShortlistedCandidate.query.filter_by(
-                job_id=job_id,
-                candidate_id=candidate.id
-            ).first()
-            
-            if not shortlisted:
-                shortlisted = ShortlistedCandidate(
-                    job_id=job_id,
-                    candidate_id=candidate.id,
-                    status=status
-                )
-                db.session.add(shortlisted)
-            else:
-                shortlisted.status = status
+        selected, total = select_top_candidates(job_id, count)
         
-        db.session.commit()
         return jsonify({
             'success': True,
-            'message': f'Successfully shortlisted top {count} candidates',
-            'selected': count,
-            'total': len(candidates)
+            'message': f'Successfully shortlisted top {selected} candidates',
+            'selected': selected,
+            'total': total
         })
     except Exception as e:
         db.session.rollback()
@@ -336,13 +254,8 @@ def shortlist_candidates_route(job_id):
 @main.route('/api/shortlist-all', methods=['POST'])
 def shortlist_all_candidates():
     """Shortlist candidates for all jobs."""
-    jobs = Job.query.all()
-    total_shortlisted = 0
-    
     try:
-        for job in jobs:
-            count = shortlist_candidates(job.id)
-            total_shortlisted += count
+        total_shortlisted = shortlist_all_jobs()
         
         return jsonify({
             'message': f'Successfully shortlisted {total_shortlisted} candidates across all jobs'
@@ -350,6 +263,32 @@ def shortlist_all_candidates():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@main.route('/api/top-candidates/<int:job_id>')
+def get_top_candidates(job_id):
+    """Get the best candidates for a job, one page at a time."""
+    k = request.args.get('k', 5, type=int)
+    if k is None or k < 1:
+        return jsonify({'success': False, 'error': 'k must be a positive integer'}), 400
+    k = min(k, MAX_TOP_CANDIDATES)
+    min_score = request.args.get('min_score', MIN_SELECTION_SCORE, type=float)
+    after_score = request.args.get('after_score', type=float)
+    after_id = request.args.get('after_id', type=int)
+    after = (after_score, after_id) if after_score is not None and after_id is not None else None
+    
+    candidates = top_candidates(job_id, k=k, min_score=min_score, after=after)
+    last = candidates[-1] if len(candidates) == k else None
+    return jsonify({
+        'success': True,
+        'candidates': [{
+            'id': c.id,
+            'name': c.name,
+            'match_score': c.match_score,
+            'email': c.email
+        } for c in candidates],
+        'next': url_for('main.get_top_candidates', job_id=job_id, k=k, min_score=min_score,
+                        after_score=last.match_score, after_id=last.id) if last else None
+    })
+
 @main.route('/api/shortlisted/<int:job_id>')
 def get_shortlisted(job_id):
     """Get shortlisted candidates for a specific job."""
@@ -364,7 +303,7 @@ def get_shortlisted(job_id):
 @main.route('/api/candidate-cv/<int:candidate_id>')
 def get_candidate_cv(candidate_id):
     """Get candidate details including CV text and match score."""
-    candidate = Candidate.query.get_or_404(candidate_id)
+    candidate = Candidate.with_content().filter_by(id=candidate_id).first_or_404()
     return jsonify({
         'cv_text': candidate.cv_text,
         'analysis': candidate.analysis
@@ -373,7 +312,7 @@ def get_candidate_cv(candidate_id):
 @main.route('/api/schedule-interviews/<int:job_id>', methods=['POST'])
 def schedule_interviews_route(job_id):
     try:
-        count = schedule_interviews(job_id)
+        count = schedule_job_interviews(job_id)
         return jsonify({'success': True, 'message': f'Successfully scheduled {count} interviews'})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error scheduling interviews: {str(e)}'})
@@ -405,7 +344,10 @@ def delete_job(job_id):
     """Delete a specific job and its associated candidates."""
     try:
         job = Job.query.get_or_404(job_id)
-        # Delete associated candidates
+        # Delete associated candidates and their analysis items
+        AnalysisItem.query.filter(
+            AnalysisItem.candidate_id.in_(db.session.query(Candidate.id).filter_by(job_id=job_id))
+        ).delete(synchronize_session=False)
         Candidate.query.filter_by(job_id=job_id).delete()
         # Delete associated shortlisted candidates
         ShortlistedCandidate.query.filter_by(job_id=job_id).delete()
@@ -421,11 +363,13 @@ def delete_job(job_id):
 def delete_all_jobs():
     """Delete all jobs and their associated candidates."""
     try:
-        # Delete all candidates
+        # Delete all candidates and their analysis items
+        AnalysisItem.query.delete()
         Candidate.query.delete()
         # Delete all shortlisted candidates
         ShortlistedCandidate.query.delete()
-        # Delete all jobs
+        # Delete all jobs and their profiles
+        JobProfile.query.delete()
         Job.query.delete()
         db.session.commit()
         return jsonify({'success': True, 'message': 'All jobs deleted successfully'})
@@ -455,6 +399,7 @@ def delete_candidates():
         if not candidate_ids:
             return jsonify({'success': False, 'error': 'No candidates specified'}), 400
             
+        AnalysisItem.query.filter(AnalysisItem.candidate_id.in_(candidate_ids)).delete(synchronize_session=False)
         Candidate.query.filter(Candidate.id.in_(candidate_ids)).delete(synchronize_session=False)
         db.session.commit()
         return jsonify({'success': True, 'message': f'{len(candidate_ids)} candidates deleted successfully'})
@@ -466,7 +411,10 @@ def delete_candidates():
 def delete_all_candidates(job_id):
     """Delete all candidates for a job."""
     try:
-        # Delete all candidates for the job
+        # Delete all candidates for the job and their analysis items
+        AnalysisItem.query.filter(
+            AnalysisItem.candidate_id.in_(db.session.query(Candidate.id).filter_by(job_id=job_id))
+        ).delete(synchronize_session=False)
         Candidate.query.filter_by(job_id=job_id).delete()
         db.session.commit()
         return jsonify({'success': True, 'message': 'All candidates deleted successfully'})
@@ -476,25 +424,87 @@ def delete_all_candidates(job_id):
 
 @main.route('/api/reanalyze-candidates/<int:job_id>', methods=['POST'])
 def reanalyze_candidates(job_id):
-    """Reanalyze all CVs for a job."""
-    try:
-        job = Job.query.get_or_404(job_id)
-        candidates = Candidate.query.filter_by(job_id=job_id).all()
-        
-        for candidate in candidates:
-            # Reanalyze the CV
-            analysis = analyze_cv(candidate.cv_text, job.description)
-            candidate.analysis = json.dumps(analysis)
-            candidate.match_score = analysis.get('match_score', 0.0)
-        
-        db.session.commit()
-        return jsonify({
-            'success': True,
-            'message': f'Successfully reanalyzed {len(candidates)} candidates'
-        })
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """Reanalyze the CVs of a job whose analysis is outdated in the background.
+
+    With ``?dry_run=1`` nothing is analyzed; the response reports how many candidates
+    would be screened on skills only, analyzed by the LLM, and how many LLM calls that takes.
+    """
+    job = Job.query.get_or_404(job_id)
+    if request.args.get('dry_run', '').lower() in ('1', 'true', 'yes'):
+        return jsonify({'success': True, 'dry_run': True, **plan_reanalysis(job.id)})
+    
+    # The task works out which candidates are outdated and sets its total
+    task = submit_task(current_app._get_current_object(), 'reanalyze-candidates', 0,
+                       reanalyze_job_candidates, job.id)
+    return task_accepted(task, 'Queued reanalysis of outdated candidates')
+
+@main.route('/api/tasks/<task_id>')
+def get_task_progress(task_id):
+    """Get progress of a background task."""
+    task = get_task(task_id)
+    if not task:
+        return jsonify({'success': False, 'error': 'Task not found'}), 404
+    return jsonify({'success': True, **task.to_dict()})
+
+@main.route('/api/analysis-cache/stats')
+def analysis_cache_stats():
+    """Get hit/miss counters and size of the LLM analysis cache."""
+    return jsonify({'success': True, **get_cache_stats()})
+
+@main.route('/api/analyzer-metrics')
+def analyzer_metrics():
+    """Get the adaptive LLM concurrency level and latency statistics of the batch analyzer."""
+    return jsonify({'success': True, **get_llm_metrics()})
+
+@main.route('/api/skill-matrix')
+def skill_matrix():
+    """Rank all candidates for every job by skill match, without calling the LLM."""
+    top_n = request.args.get('top', 10, type=int)
+    if top_n is None or top_n < 1:
+        return jsonify({'success': False, 'error': 'top must be a positive integer'}), 400
+    top_n = min(top_n, MAX_TOP_CANDIDATES)
+    
+    jobs = db.session.query(Job.id, Job.title).order_by(Job.id).all()
+    candidates = db.session.query(Candidate.id, Candidate.name, Candidate.skills, Candidate.features_version).all()
+    candidate_skills = [json.loads(c.skills) if c.skills else [] for c in candidates]
+    
+    # Stale job profiles and CV features are refreshed in the background; until then jobs
+    # without a current profile are left unranked and candidates are ranked on their stored skills
+    job_skills, stale_profiles = get_stored_job_skills()
+    profiles_task = None
+    if stale_profiles:
+        profiles_task = find_active_task('build-job-profiles') or submit_task(
+            current_app._get_current_object(), 'build-job-profiles', 0, build_job_profiles)
+    stale = sum(1 for c in candidates if c.features_version != SKILL_TAXONOMY_VERSION)
+    features_task = None
+    if stale:
+        features_task = find_active_task('refresh-features') or submit_task(
+            current_app._get_current_object(), 'refresh-features', stale, refresh_features)
+    
+    ranked_jobs = [j for j in jobs if j.id in job_skills]
+    start = time.perf_counter()
+    rankings = rank_candidates(
+        [c.id for c in candidates], candidate_skills,
+        [j.id for j in ranked_jobs], [job_skills[j.id] for j in ranked_jobs],
+        top_n=top_n
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    names = {c.id: c.name for c in candidates}
+    return jsonify({
+        'success': True,
+        'elapsed_ms': round(elapsed_ms, 2),
+        'stale_features': stale,
+        'features_task_id': features_task.id if features_task else None,
+        'stale_profiles': stale_profiles,
+        'profiles_task_id': profiles_task.id if profiles_task else None,
+        'jobs': [{
+            'job_id': j.id,
+            'title': j.title,
+            'profile_pending': j.id not in rankings,
+            'top_candidates': [dict(entry, name=names[entry['candidate_id']]) for entry in rankings.get(j.id, [])]
+        } for j in jobs]
+    })
 
 @main.route('/api/send-interview-invite/<int:candidate_id>', methods=['POST'])
 def send_interview_invite(candidate_id):
@@ -523,34 +533,21 @@ def send_interview_invite(candidate_id):
 
 @main.route('/api/send-all-invites', methods=['POST'])
 def send_all_invites():
-    """Send interview invites to all selected candidates."""
+    """Send interview invites to all selected candidates in the background."""
     try:
         meeting_data = request.get_json()
         job_id = request.args.get('job_id')
         
         # Get all selected candidates
-        candidates = Candidate.query.filter(
+        candidate_ids = [row.id for row in db.session.query(Candidate.id).filter(
             Candidate.job_id == job_id,
             Candidate.shortlisted == True
-        ).all()
+        )]
+        invites = [{'candidate_id': candidate_id, 'meeting_data': meeting_data} for candidate_id in candidate_ids]
         
-        sent_count = 0
-        errors = []
-        
-        for candidate in candidates:
-            try:
-                candidate.send_interview_invite(meeting_data)
-                sent_count += 1
-            except Exception as e:
-                errors.append(f"Failed to send to {candidate.name}: {str(e)}")
-        
-        return jsonify({
-            'success': True,
-            'sent': sent_count,
-            'total': len(candidates),
-            'errors': errors,
-            'message': f'Successfully sent {sent_count} out of {len(candidates)} invites'
-        })
+        task = submit_task(current_app._get_current_object(), 'send-invites', len(invites),
+                           send_interview_invites, invites)
+        return task_accepted(task, f'Queued {len(invites)} invites')
     except Exception as e:
         return jsonify({
             'success': False,
@@ -562,7 +559,7 @@ def schedule_interviews():
     """Schedule interviews for multiple candidates with automatic meeting link generation."""
     try:
         data = request.get_json()
-        start_datetime = datetime.fromisoformat(data['startDateTime'])
+        start_datetime = parse_interview_time(data['startDateTime'])
         meeting_duration = int(data['meetingDuration'])
         break_duration = int(data['breakDuration'])
         additional_notes = data.get('additionalNotes', '')
@@ -575,86 +572,36 @@ def schedule_interviews():
                 'error': 'Job ID is required'
             }), 400
 
-        # Get all candidates
-        candidates = Candidate.query.filter(
-            Candidate.id.in_(candidate_ids),
-            Candidate.job_id == job_id
-        ).all()
-        
-        # Sort candidates by match score to prioritize higher scoring candidates
-        candidates.sort(key=lambda x: x.match_score, reverse=True)
-        
-        scheduled_count = 0
-        current_datetime = start_datetime
+        # One query, all slots up front and a single bulk update and commit
+        result = schedule_candidates(job_id, candidate_ids, start_datetime, meeting_duration,
+                                     break_duration, additional_notes)
+        invites = result['invites']
         
-        for candidate in candidates:
-            try:
-                # Generate unique meeting link using Google Meet-like format
-                meeting_id = ''.join(random.choices('abcdefghijkmnpqrstuvwxyz23456789', k=10))
-                meeting_link = f"https://meet.google.com/{meeting_id}"
-                
-                # Format the email with personalized message
-                personalized_notes = additional_notes.replace('{name}', candidate.name)
-                
-                meeting_data = {
-                    'meetingDate': current_datetime.strftime('%Y-%m-%d %H:%M'),
-                    'meetingDuration': meeting_duration,
-                    'meetingLink': meeting_link,
-                    'additionalNotes': f"""Dear {candidate.name},
-
-We are pleased to invite you for an interview. Your interview has been scheduled for:
-
-Date: {current_datetime.strftime('%A, %B %d, %Y')}
-Time: {current_datetime.strftime('%I:%M %p')}
-Duration: {meeting_duration} minutes
-
-Meeting Link: {meeting_link}
-
-{personalized_notes}
-
-Please ensure you:
-1. Test your audio and video before the interview
-2. Join the meeting 5 minutes early
-3. Have a stable internet connection
-4. Keep your CV and portfolio ready
-
-If you need to reschedule, please contact us at least 24 hours before the interview.
-
-Best regards,
-{current_app.config.get('COMPANY_NAME', 'Our')} Recruitment Team"""
-                }
-                
-                # Send the invite
-                candidate.send_interview_invite(meeting_data)
-                
-                # Update candidate status
-                shortlisted = ShortlistedCandidate.query.filter_by(
-                    candidate_id=candidate.id,
-                    job_id=job_id
-                ).first()
-                
-                if shortlisted:
-                    shortlisted.interview_date = current_datetime
-                    shortlisted.status = 'Scheduled'
-                
-                scheduled_count += 1
-                
-                # Add duration and break for next interview
-                current_datetime += timedelta(minutes=meeting_duration + break_duration)
-                
-            except Exception as e:
-                current_app.logger.error(f"Error scheduling interview for {candidate.name}: {str(e)}")
-                continue
-        
-        db.session.commit()
+        # Invites are emailed in the background once the schedule is saved
+        task = submit_task(current_app._get_current_object(), 'send-invites', len(invites),
+                           send_interview_invites, invites)
         
         return jsonify({
             'success': True,
-            'message': f'Successfully scheduled {scheduled_count} interviews',
-            'scheduled': scheduled_count,
-            'total': len(candidates)
+            'message': f'Successfully scheduled {result["scheduled"]} interviews, sending invites',
+            'scheduled': result['scheduled'],
+            'total': len(candidate_ids),
+            'invite_task_id': task.id,
+            'invite_status_url': url_for('main.get_task_progress', task_id=task.id)
         })
         
+    except SlotConflictError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 409
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': f'Invalid request: {str(e)}'
+        }), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -682,10 +629,16 @@ def reschedule_interview(interview_id):
     """Reschedule an interview."""
     try:
         data = request.get_json()
-        new_datetime = datetime.fromisoformat(data['newDateTime'])
+        new_datetime = parse_interview_time(data['newDateTime'])
         
         interview = ShortlistedCandidate.query.get_or_404(interview_id)
+        duration = interview.interview_duration or INTERVIEW_DEFAULT_DURATION
+        
+        # The new time must be in business hours and free on this or another panel
+        panel = load_allocator(new_datetime, exclude_ids=[interview.id]).reserve(new_datetime, duration, interview.panel)
         interview.interview_date = new_datetime
+        interview.interview_duration = duration
+        interview.panel = panel
         
         db.session.commit()
         
@@ -693,6 +646,18 @@ def reschedule_interview(interview_id):
             'success': True,
             'message': 'Interview rescheduled successfully'
         })
+    except SlotConflictError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 409
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': f'Invalid request: {str(e)}'
+        }), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -0,0 +1,96 @@
+"""Measure the database work of scheduling a hiring drive, per-candidate lookups versus one batch.
+
+Seeds an SQLite database with one job and shortlisted candidates, then schedules all of
+them twice: once the way the schedule-interviews route used to (a shortlist lookup and
+ORM update per candidate) and once with agents.scheduler.schedule_candidates.
+
+Usage: python benchmarks/interview_scheduling.py [--candidates 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from database.db import db
+from app.models.job import Job
+from app.models.candidate import Candidate
+from app.models.shortlisted_candidate import ShortlistedCandidate
+from agents.scheduler import schedule_candidates, generate_meeting_link
+
+START = datetime(2026, 11, 2, 9, 0)
+
+
+def seed(candidates):
+    """Insert one job and ``candidates`` shortlisted candidates."""
+    db.session.add(Job(id=1, title='Python Developer', description='Python SQL', requirements=''))
+    db.session.bulk_insert_mappings(Candidate, [
+        {'id': i, 'name': f'Candidate {i}', 'match_score': (i % 100) / 100, 'job_id': 1}
+        for i in range(1, candidates + 1)
+    ])
+    db.session.bulk_insert_mappings(ShortlistedCandidate, [
+        {'candidate_id': i, 'job_id': 1, 'status': 'pending'}
+        for i in range(1, candidates + 1)
+    ])
+    db.session.commit()
+
+
+def schedule_per_candidate(candidate_ids):
+    """The previous route: load candidates, then look up and update each shortlist row in turn."""
+    candidates = Candidate.query.filter(Candidate.id.in_(candidate_ids), Candidate.job_id == 1).all()
+    candidates.sort(key=lambda x: x.match_score, reverse=True)
+    current = START
+    for candidate in candidates:
+        shortlisted = ShortlistedCandidate.query.filter_by(candidate_id=candidate.id, job_id=1).first()
+        if shortlisted:
+            shortlisted.interview_date = current
+            shortlisted.status = 'Scheduled'
+            shortlisted.meeting_link = generate_meeting_link()
+        current += timedelta(minutes=40)
+    db.session.commit()
+
+
+def measure(label, run):
+    """Print the statements issued and the elapsed time of ``run()``."""
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    db.session.expunge_all()
+    start = time.perf_counter()
+    run()
+    elapsed = (time.perf_counter() - start) * 1000
+    event.remove(db.engine, 'before_cursor_execute', count)
+    print(f"  {label:<16} {len(statements):>6} statements  {elapsed:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'scheduling.db')}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            seed(args.candidates)
+            candidate_ids = list(range(1, args.candidates + 1))
+            print(f"scheduling {args.candidates} candidates")
+            measure('per-candidate', lambda: schedule_per_candidate(candidate_ids))
+            measure('batch', lambda: schedule_candidates(1, candidate_ids, START, 30, 10))
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
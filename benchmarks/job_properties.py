@@ -0,0 +1,36 @@
+"""Time reads of Job text attributes with per-access cleaning (old) and stored canonical text (new).
+
+Usage: python benchmarks/job_properties.py [--chars 4000] [--reads 100000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.job import Job, clean_job_text
+from app.models.candidate import Candidate
+from app.models.shortlisted_candidate import ShortlistedCandidate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chars', type=int, default=4000, help='length of the job description')
+    parser.add_argument('--reads', type=int, default=100000)
+    args = parser.parse_args()
+
+    text = ("Senior Python developer, 5+ years' experience with SQL and ''cloud'' platforms. " * (args.chars // 80 + 1))[:args.chars]
+    job = Job(title='Python Developer', description=text, requirements=text)
+
+    # The removed property ran clean_job_text over the stored text on every read
+    old = timeit.timeit(lambda: clean_job_text(job.description), number=args.reads)
+    new = timeit.timeit(lambda: job.description, number=args.reads)
+
+    print(f"{args.reads} reads of a {args.chars}-character description")
+    print(f"  clean on read  {old / args.reads * 1e6:8.3f} us/read")
+    print(f"  stored clean   {new / args.reads * 1e6:8.3f} us/read  ({old / new:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
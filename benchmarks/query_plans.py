@@ -0,0 +1,139 @@
+"""Compare query plans and timings of the hot query paths with and without the composite indexes.
+
+Seeds two SQLite databases with the same synthetic data, one with the schema as it was
+before migration a41f6d2e9c58 and one with the current models, then prints the
+EXPLAIN QUERY PLAN output and median run time of each query on both.
+
+Usage: python benchmarks/query_plans.py [--candidates 100000] [--jobs 50] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db import db
+from app.models.job import Job
+from app.models.candidate import Candidate
+from app.models.shortlisted_candidate import ShortlistedCandidate
+from app.models.cv_document import CVDocument
+from app.models.analysis_cache import AnalysisCacheEntry
+
+# Indexes and constraints added by migration a41f6d2e9c58
+NEW_INDEXES = {
+    'ix_candidate_job_id_match_score',
+    'uq_shortlisted_candidate_job_id_candidate_id',
+    'ix_shortlisted_candidate_status_interview_date',
+    'ix_shortlisted_candidate_candidate_id',
+}
+
+QUERIES = {
+    'candidates for a job':
+        "SELECT id, name, match_score FROM candidate WHERE job_id = :job_id",
+    'top 5 candidates for a job': (
+        "SELECT id, match_score FROM candidate WHERE job_id = :job_id AND match_score >= 0.45 "
+        "ORDER BY match_score DESC, id LIMIT 5"
+    ),
+    'shortlist row for a candidate':
+        "SELECT id, status FROM shortlisted_candidate WHERE job_id = :job_id AND candidate_id = :candidate_id",
+    'scheduled interviews': (
+        "SELECT id, interview_date FROM shortlisted_candidate WHERE status = 'Scheduled' "
+        "AND interview_date IS NOT NULL ORDER BY interview_date"
+    ),
+}
+
+
+def create_schema(engine, with_indexes):
+    """Create the tables, leaving out the new indexes unless ``with_indexes`` is set."""
+    metadata = sa.MetaData()
+    for table in db.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        if not with_indexes:
+            for index in [i for i in copy.indexes if i.name in NEW_INDEXES]:
+                copy.indexes.discard(index)
+            for constraint in [c for c in copy.constraints if c.name in NEW_INDEXES]:
+                copy.constraints.discard(constraint)
+    metadata.create_all(engine)
+
+
+def seed(engine, candidates, jobs, seed_value=42):
+    """Insert ``jobs`` jobs, ``candidates`` candidates and a shortlist row for every fifth candidate."""
+    rng = random.Random(seed_value)
+    now = datetime(2026, 1, 1, 9, 0)
+    statuses = ['pending', 'Selected', 'Rejected', 'Scheduled']
+
+    with engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), [
+            {'id': j, 'title': f'Job {j}', 'description': 'Python developer', 'requirements': '',
+             'created_at': now}
+            for j in range(1, jobs + 1)
+        ])
+        conn.execute(Candidate.__table__.insert(), [
+            {'id': c, 'name': f'Candidate {c}', 'cv_text': 'cv', 'job_id': rng.randint(1, jobs),
+             'match_score': rng.random(), 'applied_at': now}
+            for c in range(1, candidates + 1)
+        ])
+        job_ids = dict(conn.execute(sa.text("SELECT id, job_id FROM candidate")).fetchall())
+        rows = []
+        for c in range(1, candidates + 1, 5):
+            status = rng.choice(statuses)
+            rows.append({
+                'candidate_id': c, 'job_id': job_ids[c], 'shortlisted_at': now, 'status': status,
+                'interview_date': now + timedelta(hours=rng.randint(0, 2000)) if status == 'Scheduled' else None
+            })
+        conn.execute(ShortlistedCandidate.__table__.insert(), rows)
+        conn.execute(sa.text("ANALYZE"))
+
+
+def measure(engine, sql, params, repeat):
+    """Get the query plan and median run time in milliseconds of ``sql``."""
+    with engine.connect() as conn:
+        plan = [row[-1] for row in conn.execute(sa.text("EXPLAIN QUERY PLAN " + sql), params)]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sa.text(sql), params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    return plan, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--jobs', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    params = {'job_id': 1, 'candidate_id': 1}
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {}
+        for label, with_indexes in (('before', False), ('after', True)):
+            engine = sa.create_engine(f"sqlite:///{os.path.join(tmp, label + '.db')}")
+            create_schema(engine, with_indexes)
+            seed(engine, args.candidates, args.jobs)
+            engines[label] = engine
+        with engines['before'].connect() as conn:
+            params['job_id'], params['candidate_id'] = conn.execute(sa.text(
+                "SELECT job_id, candidate_id FROM shortlisted_candidate LIMIT 1")).one()
+
+        print(f"{args.candidates} candidates, {args.jobs} jobs, median of {args.repeat} runs\n")
+        for name, sql in QUERIES.items():
+            print(name)
+            for label, engine in engines.items():
+                plan, elapsed = measure(engine, sql, params, args.repeat)
+                print(f"  {label:<6} {elapsed:8.3f} ms  {' | '.join(plan)}")
+            print()
+
+        for engine in engines.values():
+            engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
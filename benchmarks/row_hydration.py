@@ -0,0 +1,97 @@
+"""Measure the memory and time it takes to load candidate list views with and without the deferred text columns.
+
+Seeds an SQLite database with candidates carrying realistic CV text and analysis JSON,
+then loads every candidate the way the list views do, once with the default (deferred)
+mapping and once with the large columns undeferred, as they were loaded before.
+
+Usage: python benchmarks/row_hydration.py [--candidates 20000] [--cv-chars 6000]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy.orm import joinedload, undefer_group
+from database.db import db
+from app.models.job import Job
+from app.models.candidate import Candidate
+from app.models.shortlisted_candidate import ShortlistedCandidate
+from app.models.cv_document import CVDocument
+from app.models.analysis_cache import AnalysisCacheEntry
+
+
+def seed(candidates, cv_chars):
+    """Insert one job, ``candidates`` candidates with ``cv_chars`` of CV text each and an interview for every other one."""
+    db.session.add(Job(id=1, title='Python Developer', description='Python SQL', requirements=''))
+    analysis = json.dumps({
+        'match_score': 0.7,
+        'strengths': ['Relevant experience'] * 10,
+        'weaknesses': ['Limited cloud exposure'] * 10,
+        'key_skills': ['Python', 'SQL', 'Docker'] * 5,
+        'recommendation': 'Proceed to interview. ' * 20
+    })
+    words = ('experience python developer project team delivered ' * (cv_chars // 50 + 1))[:cv_chars]
+    db.session.bulk_insert_mappings(Candidate, [
+        {'id': i, 'name': f'Candidate {i}', '_cv_text': f'{i} {words}', 'analysis': analysis,
+         'match_score': (i % 100) / 100, 'job_id': 1}
+        for i in range(1, candidates + 1)
+    ])
+    db.session.bulk_insert_mappings(ShortlistedCandidate, [
+        {'candidate_id': i, 'job_id': 1, 'status': 'Scheduled'}
+        for i in range(1, candidates + 1, 2)
+    ])
+    db.session.commit()
+
+
+def measure(label, load):
+    """Print the peak traced memory and elapsed time of ``load()``."""
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = load()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} {len(rows):>7} rows  peak {peak / 1024 / 1024:8.1f} MiB  {elapsed:8.1f} ms")
+    del rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=20000)
+    parser.add_argument('--cv-chars', type=int, default=6000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'hydration.db')}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            seed(args.candidates, args.cv_chars)
+            print(f"{args.candidates} candidates, {args.cv_chars} characters of CV text each\n")
+
+            print("candidate list (/candidates/<job_id>)")
+            measure('eager', lambda: Candidate.query.options(undefer_group('content')).filter_by(job_id=1).all())
+            measure('deferred', lambda: Candidate.query.filter_by(job_id=1).all())
+
+            print("interviews join (/interviews)")
+            measure('eager', lambda: ShortlistedCandidate.query.options(
+                joinedload(ShortlistedCandidate.candidate).undefer_group('content')).all())
+            measure('deferred', lambda: ShortlistedCandidate.query.options(
+                joinedload(ShortlistedCandidate.candidate)).all())
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
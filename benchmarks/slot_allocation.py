@@ -0,0 +1,58 @@
+"""Measure interview slot allocation as the number of interviews already booked grows.
+
+Books a number of random interviews across the panels, then allocates a hiring drive
+around them with agents.slot_allocator.SlotAllocator and checks the result for overlaps.
+
+Usage: python benchmarks/slot_allocation.py [--interviews 500] [--booked 1000 10000 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.slot_allocator import SlotAllocator
+from config import INTERVIEW_PANELS
+
+START = datetime(2026, 11, 2, 9, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interviews', type=int, default=500)
+    parser.add_argument('--booked', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--panels', type=int, default=INTERVIEW_PANELS)
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"allocating {args.interviews} 45 minute interviews on {args.panels} panels")
+    for booked in args.booked:
+        allocator = SlotAllocator(panels=args.panels)
+        # Spread existing bookings over enough weekdays to leave some room
+        days = max(booked // (args.panels * 4), 1)
+        bookings = sorted(
+            (START + timedelta(days=random.randrange(days), minutes=15 * random.randrange(28)),
+             random.choice([30, 45, 60]), random.randrange(args.panels))
+            for _ in range(booked)
+        )
+        # Bookings arrive in date order, as agents.scheduler.load_allocator queries them
+        start = time.perf_counter()
+        for slot, duration, panel in bookings:
+            allocator.block(slot, duration, panel)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        slots = allocator.allocate(args.interviews, START, 45, 10)
+        allocate_ms = (time.perf_counter() - start) * 1000
+
+        for calendar in allocator.calendars:
+            assert all(calendar.ends[i] <= calendar.starts[i + 1] for i in range(len(calendar) - 1))
+        print(f"  {booked:>7} booked  load {load_ms:8.1f} ms  allocate {allocate_ms:8.1f} ms  "
+              f"last slot {slots[-1][0]:%Y-%m-%d %H:%M}")
+
+
+if __name__ == '__main__':
+    main()
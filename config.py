@@ -3,10 +3,65 @@
 # Ollama Model Configuration
 OLLAMA_MODEL = "llama3:latest"  # Can be changed to 'llama2:latest', 'codellama:latest', etc.
 OLLAMA_ENDPOINT = "http://127.0.0.1:11434"
+OLLAMA_MAX_CONNECTIONS = 16  # Connection pool size of the async Ollama client, keep >= LLM_MAX_CONCURRENCY
+OLLAMA_MAX_KEEPALIVE_CONNECTIONS = 5  # Idle connections kept open for reuse
+OLLAMA_TIMEOUT = 120.0  # Seconds to wait for an LLM response
+OLLAMA_CONNECT_TIMEOUT = 5.0  # Seconds to wait for a connection to the Ollama host
 
 # Analysis Settings
 MAX_TEXT_LENGTH = 4000  # Maximum characters for CV and job description
-BATCH_SIZE = 5  # Number of CVs to process in parallel
+BATCH_SIZE = 5  # Initial number of CV analyses in flight, adapted at runtime
+LLM_MIN_CONCURRENCY = 1  # Lower bound for the adaptive LLM concurrency limit
+LLM_MAX_CONCURRENCY = 16  # Upper bound for the adaptive LLM concurrency limit
+LLM_LATENCY_TOLERANCE = 1.5  # Back off when recent latency exceeds the long-run average by this factor
+LLM_BACKOFF_RATIO = 0.7  # Multiply the limit by this on errors or latency spikes
+PREFILTER_MIN_SKILL_MATCH = 0.2  # Skip the LLM for CV/job pairs with less skill overlap than this
+SCREENING_TOP_K = 100  # Per job, only this many best skill matches get an LLM analysis (None for no limit)
+REANALYSIS_BATCH_SIZE = 50  # Outdated candidates loaded, analyzed concurrently and committed per batch
+
+# Prompt Settings (bump CV_ANALYSIS_TEMPLATE_VERSION when changing these)
+PROMPT_CV_TOKEN_BUDGET = 600  # Estimated tokens of CV sections packed into each analysis prompt
+PROMPT_JD_TOKEN_BUDGET = 400  # Estimated tokens of job description or summary in each analysis prompt
+PROMPT_SEGMENT_CHARS = 600  # Longest CV segment ranked and packed as a unit
+PROMPT_CHARS_PER_TOKEN = 4  # Characters per token used to estimate prompt sizes
+
+# Analysis Cache Settings
+CV_ANALYSIS_TEMPLATE_VERSION = 2  # Bump whenever CV_ANALYSIS_TEMPLATE changes to invalidate cached analyses
+ANALYSIS_CACHE_MAX_ENTRIES = 10000  # Least recently used entries are evicted beyond this
+ANALYSIS_CACHE_WRITE_BATCH = 50  # Buffered cache writes (stores and hit counts) that trigger a flush
+ANALYSIS_CACHE_EVICT_EVERY = 100  # Stores between checks of the cache size against the limit
+
+# Background Task Settings
+TASK_WORKERS = 2  # Number of uploads/reanalyses processed concurrently in the background
+TASK_HISTORY_LIMIT = 100  # Number of tasks kept in memory for progress polling
+
+# Interview Scheduling Settings
+INTERVIEW_PANELS = 2  # Interview panels that can run interviews at the same time
+INTERVIEW_DEFAULT_DURATION = 60  # Minutes assumed for booked interviews without a stored duration
+BUSINESS_HOURS = (9, 17)  # Interviews must start and end between these hours
+BUSINESS_DAYS = (0, 1, 2, 3, 4)  # Weekdays interviews can be held on, Monday is 0
+SCHEDULING_HORIZON_DAYS = 365  # Days searched for free slots before giving up
+
+# Mail Settings
+MAIL_BATCH_SIZE = 100  # Emails sent over one SMTP connection before it is closed and reopened
+MAIL_MAX_ATTEMPTS = 3  # Sends per email before a transient SMTP failure is reported
+MAIL_RETRY_BACKOFF = 2.0  # Seconds before the first retry, doubled for each retry after it
+
+# PDF Extraction Settings
+PDF_WORKERS = 4  # Processes used to extract CV text in parallel
+PDF_TIMEOUT = 30  # Seconds allowed per PDF before it is reported as failed
+PDF_MAX_PAGES = 20  # Pages read per CV; the rest of very long documents is ignored
+
+# Job Import Settings
+JOB_IMPORT_CHUNK_SIZE = 5000  # CSV rows parsed and inserted per batch
+JOB_IMPORT_SAMPLE_BYTES = 64 * 1024  # Bytes read up front to pick the CSV encoding
+JOB_IMPORT_ENCODINGS = ['utf-8', 'latin1']  # Tried in order on the sample; latin1 accepts any bytes
+
+# Job Profile Settings
+JOB_PROFILE_BATCH_SIZE = 1000  # Jobs profiled and committed per batch in the background
+JOB_SUMMARIES_ENABLED = True  # Generate an LLM summary of every job profile in the background
+JOB_SUMMARY_IN_PROMPT = True  # Send the job summary instead of the full description to the LLM once it is ready
+JOB_PROMPT_VERSION = 1  # Bump when the job text put in prompts changes (e.g. the summary format) to redo analyses
 
 # Scoring Weights
 SCORE_WEIGHTS = {
@@ -35,6 +90,42 @@ SOFT_SKILLS = [
     'Interpersonal Skills', 'Presentation Skills', 'Negotiation', 'Mentoring'
 ]
 
+# Bump whenever the skill lists or aliases change so stored CV skill profiles are recomputed
+SKILL_TAXONOMY_VERSION = 1
+
+# Optional per-skill weights for skill-matrix ranking (skills not listed weigh 1.0)
+SKILL_WEIGHTS = {}
+
+# Alternative spellings mapped to the canonical skill names above
+SKILL_ALIASES = {
+    'JavaScript': ['JS', 'ECMAScript'],
+    'C++': ['CPP'],
+    'Kubernetes': ['K8s'],
+    'Vue.js': ['VueJS', 'Vue'],
+    'Node.js': ['NodeJS'],
+    'CI/CD': ['Continuous Integration', 'Continuous Delivery', 'Continuous Deployment'],
+    'Machine Learning': ['ML', 'Deep Learning'],
+    'AI': ['Artificial Intelligence'],
+    'Data Analysis': ['Data Analytics'],
+    'Cloud': ['Cloud Computing'],
+    'Security': ['Cybersecurity', 'Cyber Security', 'Information Security'],
+    'REST': ['RESTful'],
+    'API': ['APIs'],
+    'MongoDB': ['Mongo'],
+    'PostgreSQL': ['Postgres'],
+    'TensorFlow': ['TF'],
+    'NLP': ['Natural Language Processing'],
+    'Team Work': ['Teamwork', 'Team Player', 'Collaboration'],
+    'Problem Solving': ['Problem-Solving', 'Troubleshooting'],
+    'Communication': ['Communication Skills'],
+    'Time Management': ['Prioritization'],
+    'Project Management': ['PMP'],
+    'Attention to Detail': ['Detail-Oriented', 'Detail Oriented'],
+    'Interpersonal Skills': ['Interpersonal'],
+    'Presentation Skills': ['Public Speaking'],
+    'Mentoring': ['Coaching']
+}
+
 # CV Analysis Template
 CV_ANALYSIS_TEMPLATE = """You are an expert HR recruiter analyzing a CV against job requirements. Be objective and thorough.
 
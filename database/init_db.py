@@ -1,8 +1,12 @@
 from flask import Flask
 from database.db import db
 from app.models.job import Job
+from app.models.job_profile import JobProfile
 from app.models.candidate import Candidate
 from app.models.shortlisted_candidate import ShortlistedCandidate
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.models.cv_document import CVDocument
+from app.models.analysis_item import AnalysisItem
 import os
 
 def init_db(app):
@@ -0,0 +1,35 @@
+"""Add analysis_cache table
+
+Revision ID: 3b7f1c2d9a4e
+Revises: e2da8f0c0d03
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7f1c2d9a4e'
+down_revision = 'e2da8f0c0d03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('analysis_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('analysis', sa.Text(), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('template_version', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_analysis_cache_last_used_at'), 'analysis_cache', ['last_used_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_analysis_cache_last_used_at'), table_name='analysis_cache')
+    op.drop_table('analysis_cache')
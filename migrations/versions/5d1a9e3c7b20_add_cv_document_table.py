@@ -0,0 +1,56 @@
+"""Store distinct CVs once in cv_document and link candidates to them
+
+Revision ID: 5d1a9e3c7b20
+Revises: 8c4e2a7f1d03
+Create Date: 2026-10-18 12:14:40.218337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1a9e3c7b20'
+down_revision = '8c4e2a7f1d03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cv_document',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('file_hash', sa.String(length=64), nullable=True),
+    sa.Column('cv_text', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash')
+    )
+    with op.batch_alter_table('cv_document', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cv_document_file_hash'), ['file_hash'], unique=False)
+
+    # Existing candidates keep their own cv_text; new ones point at a shared document instead
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('document_id', sa.Integer(), nullable=True))
+        batch_op.alter_column('cv_text', existing_type=sa.Text(), nullable=True)
+        batch_op.create_index(batch_op.f('ix_candidate_document_id'), ['document_id'], unique=False)
+        batch_op.create_foreign_key('fk_candidate_document_id_cv_document', 'cv_document', ['document_id'], ['id'])
+
+
+def downgrade():
+    # Copy shared texts back onto the candidates before the link is dropped
+    op.execute(
+        "UPDATE candidate SET cv_text = "
+        "(SELECT cv_text FROM cv_document WHERE cv_document.id = candidate.document_id) "
+        "WHERE document_id IS NOT NULL"
+    )
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_candidate_document_id_cv_document', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_candidate_document_id'))
+        batch_op.alter_column('cv_text', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column('document_id')
+
+    with op.batch_alter_table('cv_document', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cv_document_file_hash'))
+
+    op.drop_table('cv_document')
@@ -0,0 +1,37 @@
+"""Add derived CV feature columns to candidate
+
+Revision ID: 8c4e2a7f1d03
+Revises: 3b7f1c2d9a4e
+Create Date: 2026-10-18 11:02:17.554912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2a7f1d03'
+down_revision = '3b7f1c2d9a4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows keep NULL features_version and are filled in lazily by Candidate.ensure_features
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('email', sa.String(length=320), nullable=True))
+        batch_op.add_column(sa.Column('detected_name', sa.String(length=200), nullable=True))
+        batch_op.add_column(sa.Column('skills', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('features_version', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_candidate_content_hash'), ['content_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_candidate_content_hash'))
+        batch_op.drop_column('features_version')
+        batch_op.drop_column('skills')
+        batch_op.drop_column('detected_name')
+        batch_op.drop_column('email')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,42 @@
+"""Add composite indexes for candidate ranking, shortlist lookups and interviews
+
+Revision ID: a41f6d2e9c58
+Revises: 5d1a9e3c7b20
+Create Date: 2026-10-18 13:05:52.690114
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41f6d2e9c58'
+down_revision = '5d1a9e3c7b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the newest shortlist row per (job, candidate) so the unique constraint can be added
+    op.execute(
+        "DELETE FROM shortlisted_candidate WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM shortlisted_candidate "
+        "GROUP BY job_id, candidate_id) AS newest)"
+    )
+
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.create_index('ix_candidate_job_id_match_score', ['job_id', 'match_score'], unique=False)
+
+    with op.batch_alter_table('shortlisted_candidate', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_shortlisted_candidate_job_id_candidate_id', ['job_id', 'candidate_id'])
+        batch_op.create_index('ix_shortlisted_candidate_status_interview_date', ['status', 'interview_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_shortlisted_candidate_candidate_id'), ['candidate_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('shortlisted_candidate', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_shortlisted_candidate_candidate_id'))
+        batch_op.drop_index('ix_shortlisted_candidate_status_interview_date')
+        batch_op.drop_constraint('uq_shortlisted_candidate_job_id_candidate_id', type_='unique')
+
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.drop_index('ix_candidate_job_id_match_score')
@@ -0,0 +1,36 @@
+"""Add skill_match_score and llm_skipped columns to candidate
+
+Revision ID: a9f1c5e3d286
+Revises: e8c4a2d7b159
+Create Date: 2026-10-18 20:03:19.528604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9f1c5e3d286'
+down_revision = 'e8c4a2d7b159'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('skill_match_score', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('llm_skipped', sa.Boolean(), nullable=True, server_default=sa.false()))
+
+    # Analyses the old skill prefilter produced never reached the LLM
+    candidate = sa.table('candidate', sa.column('analysis', sa.Text), sa.column('llm_skipped', sa.Boolean))
+    op.execute(
+        candidate.update()
+        .where(candidate.c.analysis.like('%Skipped detailed analysis%'))
+        .values(llm_skipped=True)
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.drop_column('llm_skipped')
+        batch_op.drop_column('skill_match_score')
@@ -0,0 +1,29 @@
+"""Add interview_duration and panel columns to shortlisted_candidate
+
+Revision ID: b6d2e9f4a813
+Revises: f3a8c1e6d924
+Create Date: 2026-10-18 18:05:31.774120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2e9f4a813'
+down_revision = 'f3a8c1e6d924'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing bookings keep NULLs: the allocator assumes the default duration and fits them on a free panel
+    with op.batch_alter_table('shortlisted_candidate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('interview_duration', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('panel', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('shortlisted_candidate', schema=None) as batch_op:
+        batch_op.drop_column('panel')
+        batch_op.drop_column('interview_duration')
@@ -0,0 +1,98 @@
+"""Store the analysis score breakdown as columns and its list items in analysis_item
+
+Revision ID: c7e3b8a1f640
+Revises: a41f6d2e9c58
+Create Date: 2026-10-18 14:31:08.402771
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3b8a1f640'
+down_revision = 'a41f6d2e9c58'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+SCORES = ['essential_skills', 'experience', 'education', 'additional']
+ITEM_KINDS = {'strengths': 'strength', 'weaknesses': 'weakness', 'key_skills': 'skill'}
+
+
+def upgrade():
+    op.create_table('analysis_item',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('value', sa.String(length=500), nullable=False),
+        sa.Column('normalized', sa.String(length=500), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_analysis_item_candidate_id'), 'analysis_item', ['candidate_id'], unique=False)
+    op.create_index('ix_analysis_item_kind_normalized', 'analysis_item', ['kind', 'normalized'], unique=False)
+
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        for score in SCORES:
+            batch_op.add_column(sa.Column(f'{score}_score', sa.Float(), nullable=True))
+            batch_op.create_index(batch_op.f(f'ix_candidate_{score}_score'), [f'{score}_score'], unique=False)
+
+    backfill()
+
+
+def backfill():
+    """Copy the breakdown and list items out of the existing analysis JSON, in id order batches."""
+    candidate = sa.table('candidate', sa.column('id', sa.Integer), sa.column('analysis', sa.Text),
+                         *(sa.column(f'{score}_score', sa.Float) for score in SCORES))
+    analysis_item = sa.table('analysis_item', sa.column('candidate_id', sa.Integer), sa.column('kind', sa.String),
+                             sa.column('value', sa.String), sa.column('normalized', sa.String),
+                             sa.column('position', sa.Integer))
+    update = candidate.update().where(candidate.c.id == sa.bindparam('candidate_id')).values(
+        **{f'{score}_score': sa.bindparam(f'{score}_score') for score in SCORES}
+    )
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(candidate.c.id, candidate.c.analysis)
+            .where(candidate.c.id > last_id).order_by(candidate.c.id).limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates, items = [], []
+        for row in rows:
+            try:
+                analysis = json.loads(row.analysis or '{}')
+            except ValueError:
+                continue
+            if not isinstance(analysis, dict) or analysis.get('recommendation') == "Pending automated analysis":
+                continue
+            breakdown = analysis.get('score_breakdown') or {}
+            updates.append({'candidate_id': row.id, **{f'{score}_score': breakdown.get(score) for score in SCORES}})
+            for key, kind in ITEM_KINDS.items():
+                for position, value in enumerate(analysis.get(key) or []):
+                    value = ' '.join(str(value).split())
+                    if value:
+                        items.append({'candidate_id': row.id, 'kind': kind, 'value': value[:500],
+                                      'normalized': value.lower()[:500], 'position': position})
+        if updates:
+            conn.execute(update, updates)
+        if items:
+            conn.execute(analysis_item.insert(), items)
+
+
+def downgrade():
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        for score in reversed(SCORES):
+            batch_op.drop_index(batch_op.f(f'ix_candidate_{score}_score'))
+            batch_op.drop_column(f'{score}_score')
+
+    op.drop_index('ix_analysis_item_kind_normalized', table_name='analysis_item')
+    op.drop_index(op.f('ix_analysis_item_candidate_id'), table_name='analysis_item')
+    op.drop_table('analysis_item')
@@ -0,0 +1,40 @@
+"""Store job title, description and requirements cleaned instead of cleaning on every read
+
+Revision ID: d52f9a6b3e17
+Revises: c7e3b8a1f640
+Create Date: 2026-10-18 15:12:26.935180
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd52f9a6b3e17'
+down_revision = 'c7e3b8a1f640'
+branch_labels = None
+depends_on = None
+
+# Same replacements, in the same order, as app.models.job.clean_job_text
+REPLACEMENTS = (("'''", ""), ("''", "'"))
+COLUMNS = ('title', 'description', 'requirements')
+
+
+def upgrade():
+    job = sa.table('job', *(sa.column(name, sa.Text) for name in COLUMNS))
+    values = {}
+    for name in COLUMNS:
+        expression = job.c[name]
+        for old, new in REPLACEMENTS:
+            expression = sa.func.replace(expression, old, new)
+        values[name] = expression
+    op.execute(
+        job.update()
+        .where(sa.or_(*(job.c[name].contains(old) for name in COLUMNS for old, _ in REPLACEMENTS)))
+        .values(**values)
+    )
+
+
+def downgrade():
+    # Cleaning is lossy and the old read path cleans again, so stored values can stay as they are
+    pass
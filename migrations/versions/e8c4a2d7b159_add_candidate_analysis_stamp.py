@@ -0,0 +1,33 @@
+"""Record what each candidate's analysis was computed with
+
+Revision ID: e8c4a2d7b159
+Revises: b6d2e9f4a813
+Create Date: 2026-10-18 19:12:47.306518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4a2d7b159'
+down_revision = 'b6d2e9f4a813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing analyses stay unstamped, so the first reanalysis of each job redoes them
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_job_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('analysis_model', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('analysis_prompt_version', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('analysis_taxonomy_version', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('candidate', schema=None) as batch_op:
+        batch_op.drop_column('analysis_taxonomy_version')
+        batch_op.drop_column('analysis_prompt_version')
+        batch_op.drop_column('analysis_model')
+        batch_op.drop_column('analysis_job_hash')
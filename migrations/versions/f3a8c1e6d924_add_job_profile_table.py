@@ -0,0 +1,38 @@
+"""Store a precomputed analysis profile per job in job_profile
+
+Revision ID: f3a8c1e6d924
+Revises: d52f9a6b3e17
+Create Date: 2026-10-18 16:41:07.512904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c1e6d924'
+down_revision = 'd52f9a6b3e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing jobs are profiled on first use, or all at once by the build-job-profiles task
+    op.create_table('job_profile',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('description_hash', sa.String(length=64), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('skills', sa.Text(), nullable=False),
+    sa.Column('taxonomy_version', sa.Integer(), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('summary_status', sa.String(length=20), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_id')
+    )
+
+
+def downgrade():
+    op.drop_table('job_profile')